@@ -1,54 +1,152 @@
 # actionQueue class
+import itertools
 import logging
-import queue
 import threading
-from time import sleep
+import time
+from dataclasses import dataclass
+
+from Metrics import LatencyHistogram
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(threadName)s - %(message)s"
 )
 
+# Lower runs first. Anything more urgent than PRIORITY_SCAN interrupts a scan at its next
+# tick; anything at or below it waits for a lull in the scan or for its deadline. Buys
+# are not queued: the scan presses the buy key itself, inline, the moment it decides.
+PRIORITY_SCAN = 10
+PRIORITY_COLLECT = 20
+
+
+@dataclass
+class ScheduledAction:
+    action: object
+    name: str
+    priority: int
+    deadline: object  # Time it should be finished by, a callable returning it, or None to run at the next chance
+    estimated_duration: float
+    enqueued_at: float
+    sequence: int
+
 
 class ActionQueue:
-    def __init__(self):
-        self.action_queue = queue.Queue()
+    """
+    Priority and deadline scheduler for bot actions.
 
-        self.worker_thread = threading.Thread(
-            target=self._worker, name="ActionQueueWorker"
-        )
-        self.worker_thread.daemon = (
-            True  # Allows main program to exit even if queue is not empty
-        )
-        self.worker_thread.start()
+    Actions run on the thread that calls run_due(), which is the bot thread, so they
+    never send input at the same time as the scan. Urgent actions interrupt a scan
+    at its next tick. Deferrable ones, like money collection, start when the scan is idle
+    and close enough to their deadline, or once they are max_defer seconds overdue.
+    Queue-wait and run times are recorded per action name.
+    """
 
-    def add(self, action):
-        self.action_queue.put(action)
+    def __init__(self, clock=time.monotonic, max_defer=30.0):
+        """
+        :param clock: Returns the current time in seconds.
+        :param max_defer: Seconds a deadline may slip while waiting for a lull in the scan.
+        """
+        self.clock = clock
+        self.max_defer = max_defer
+        self._lock = threading.Lock()  # Guards the pending list
+        self._pending = []
+        self._sequence = itertools.count()
+        self.wait_times = {}  # name -> LatencyHistogram of time from due to started
+        self.run_times = {}  # name -> LatencyHistogram of run time
+
+    def add(self, action, priority=PRIORITY_COLLECT, deadline=None, estimated_duration=0.0, name=None):
+        """
+        Queues an action.
+
+        :param action: A callable taking no arguments.
+        :param priority: One of the PRIORITY_ constants; lower runs first.
+        :param deadline: Optional clock time the action should be finished by, or a callable returning
+                         it, which is asked again every time the queue is checked.
+        :param estimated_duration: Seconds the action is expected to take, until it has been measured.
+        :param name: Action type for the statistics. Defaults to the callable's name.
+        """
+        item = ScheduledAction(action, name or action.__name__, priority, deadline, estimated_duration,
+                               self.clock(), next(self._sequence))
+        with self._lock:
+            self._pending.append(item)
         logging.info(
-            f"Action '{action.__name__}' added to the queue. Current queue size: {self.action_queue.qsize()}"
+            f"Action '{item.name}' added to the queue (priority {priority}). Current queue size: {len(self._pending)}"
         )
 
-    def get_queue_size(self):
+    def estimate(self, name, fallback=0.0):
+        """Returns the measured mean run time of an action type, or fallback if it never ran."""
+        histogram = self.run_times.get(name)
+        if histogram is None or not histogram.count:
+            return fallback
+        return histogram.summary()["mean"]
+
+    def _start_by(self, item):
+        if item.deadline is None:
+            return item.enqueued_at
+        deadline = item.deadline() if callable(item.deadline) else item.deadline
+        return deadline - self.estimate(item.name, item.estimated_duration)
+
+    def _is_due(self, item, now):
+        return item.priority < PRIORITY_SCAN or now >= self._start_by(item)
+
+    def _is_overdue(self, item, now):
+        return item.priority < PRIORITY_SCAN or now >= self._start_by(item) + self.max_defer
+
+    def should_yield(self, idle):
         """
-        Returns the current size of the action queue.
+        Tells a scan whether to stop so queued actions can run.
+
+        :param idle: True if the scan has nothing on screen worth waiting for.
+        :return: True if an urgent or overdue action is waiting, or a due one is and the scan is idle.
         """
-        return self.action_queue.qsize()
+        now = self.clock()
+        with self._lock:
+            return any(self._is_overdue(item, now) or (idle and self._is_due(item, now)) for item in self._pending)
+
+    def _record(self, name, waited, ran):
+        for table, seconds in ((self.wait_times, waited), (self.run_times, ran)):
+            if name not in table:
+                table[name] = LatencyHistogram(max_seconds=3600)
+            table[name].record(seconds)
 
-    def _worker(self):
-        logging.info("Worker thread started.")
+    def run_due(self):
+        """
+        Runs every due action on the calling thread, most urgent first.
+        Errors from an action propagate, so stopping the bot from inside one still works.
 
-        # 4. An infinite loop to continuously check the queue
+        :return: The names of the actions that ran.
+        """
+        ran = []
         while True:
-            # The get() method blocks until an item is available
-            action = self.action_queue.get()
+            now = self.clock()
+            with self._lock:
+                due = [item for item in self._pending if self._is_due(item, now)]
+                if not due:
+                    return ran
+                item = min(due, key=lambda due_item: (due_item.priority, self._start_by(due_item), due_item.sequence))
+                self._pending.remove(item)
 
+            logging.info(f"Executing action '{item.name}'.")
+            waited = now - max(item.enqueued_at, self._start_by(item))
+            started = self.clock()
             try:
-                # 6. Robust error handling for each action
-                logging.info(f"Executing action '{action.__name__}'.")
-                action()
-            except Exception as e:
-                logging.error(
-                    f"Error executing action '{action.__name__}': {e}", exc_info=True
-                )
+                item.action()
             finally:
-                # Signal that the task from the queue is done
-                self.action_queue.task_done()
+                self._record(item.name, waited, self.clock() - started)
+            ran.append(item.name)
+
+    def execute(self, action, name=None):
+        """Runs an action immediately on the calling thread, recording its run time under name."""
+        started = self.clock()
+        try:
+            return action()
+        finally:
+            self._record(name or action.__name__, 0.0, self.clock() - started)
+
+    def stats(self):
+        """
+        Returns the recorded timings.
+
+        :return: {name: {"wait": LatencyHistogram.summary(), "run": LatencyHistogram.summary()}}
+        """
+        return {name: {"wait": self.wait_times[name].summary(), "run": self.run_times[name].summary()}
+                for name in self.run_times}
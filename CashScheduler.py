@@ -0,0 +1,226 @@
+"""
+Decides when to stop scanning and walk to collect money, to maximise realised cash per hour.
+
+Model: the plot accrues cash at accrual_rate ($/s), which is base_income plus the
+income of every brainrot bought this session. Collecting realises the accrued cash
+but takes collect_cost seconds away from scanning. Scanning finds matches at
+arrival_rate (per second of scanning), each worth its income for
+match_value_seconds. Collecting pays off once the cash it realises per second of
+walking beats what scanning would earn in that time:
+
+    accrual_rate * t / collect_cost >= arrival_rate * mean_match_income * match_value_seconds
+
+so the next collection is due t seconds after the previous one, clamped to
+[min_interval, max_interval]. With no accrual measured yet, t is max_interval.
+
+Run as a script to replay a recorded trace under fixed intervals and this policy:
+    python CashScheduler.py trace.jsonl [--base-income N] [--intervals 60,120,300]
+Trace records (written when trace_path is set) look like:
+    {"t": 12.5, "event": "match", "income": 1200.0}
+    {"t": 300.2, "event": "collect", "seconds": 11.8}
+"""
+import argparse
+import json
+import time
+from collections import deque
+
+
+class CashScheduler:
+    def __init__(self, min_interval=60.0, max_interval=300.0, match_value_seconds=600.0, base_income=0.0,
+                 default_collect_cost=12.0, history_seconds=1800.0, clock=time.monotonic, log=None, trace_path=None):
+        """
+        :param min_interval: Shortest time between two collections, in seconds. Capped at max_interval.
+        :param max_interval: Longest time between two collections, in seconds.
+        :param match_value_seconds: Seconds of a bought brainrot's income counted as its value.
+        :param base_income: Plot income ($/s) before anything is bought this session.
+        :param default_collect_cost: Seconds a collection is assumed to take until one was measured.
+        :param history_seconds: Seconds of scanning the arrival rate is measured over.
+        :param clock: Returns the current time in seconds.
+        :param log: Optional callable(message) that receives every decision.
+        :param trace_path: Optional JSONL file that matches and collections are appended to.
+        """
+        # A user's collect_money_interval below the default minimum must still be honoured
+        self.min_interval = min(min_interval, max_interval)
+        self.max_interval = max_interval
+        self.match_value_seconds = match_value_seconds
+        self.base_income = base_income
+        self.default_collect_cost = default_collect_cost
+        self.history_seconds = history_seconds
+        self.clock = clock
+        self.log = log
+        self.trace_path = trace_path
+
+        self.started_at = clock()
+        self.last_collect_at = self.started_at
+        self.collect_seconds = 0.0  # Total time spent collecting, which is not scan time
+        self.collect_costs = deque(maxlen=10)
+        self.matches = deque()  # (scan seconds when found, income)
+        self.bought_income = 0.0
+        self.reason = None
+
+    @classmethod
+    def from_settings(cls, settings, clock=time.monotonic, log=None):
+        """
+        Builds a scheduler from the settings dictionary.
+
+        :return: A CashScheduler, or None if 'ev_collect_scheduling' is turned off.
+        """
+        if not settings.get("ev_collect_scheduling", True):
+            return None
+        return cls(
+            min_interval=settings.get("collect_min_interval", 60),
+            max_interval=settings.get("collect_money_interval", 300),
+            match_value_seconds=settings.get("match_value_seconds", 600),
+            base_income=settings.get("plot_income", 0),
+            clock=clock,
+            log=log,
+            trace_path=settings.get("schedule_trace_path") or None,
+        )
+
+    def _trace(self, event, **fields):
+        if self.trace_path:
+            with open(self.trace_path, 'a') as f:
+                f.write(json.dumps({"t": round(self.clock() - self.started_at, 3), "event": event, **fields}) + "\n")
+
+    def scan_seconds(self):
+        """Seconds spent on anything but collecting since the scheduler started."""
+        return self.clock() - self.started_at - self.collect_seconds
+
+    def record_match(self, income):
+        """Records a bought brainrot; its income is added to the plot's accrual rate."""
+        income = income or 0.0
+        self.matches.append((self.scan_seconds(), income))
+        self.bought_income += income
+        self._trace("match", income=income)
+
+    def record_collect(self, seconds):
+        """Records a finished collection and how long it took."""
+        self.collect_costs.append(seconds)
+        self.collect_seconds += seconds
+        self.last_collect_at = self.clock()
+        self._trace("collect", seconds=round(seconds, 3))
+
+    def accrual_rate(self):
+        return self.base_income + self.bought_income
+
+    def collect_cost(self):
+        if not self.collect_costs:
+            return self.default_collect_cost
+        return sum(self.collect_costs) / len(self.collect_costs)
+
+    def scan_value_rate(self):
+        """Expected cash value per second of scanning, from the recent match history."""
+        scanned = self.scan_seconds()
+        while self.matches and self.matches[0][0] < scanned - self.history_seconds:
+            self.matches.popleft()
+        if not self.matches or scanned <= 0:
+            return 0.0
+        arrival_rate = len(self.matches) / min(scanned, self.history_seconds)
+        mean_income = sum(income for _, income in self.matches) / len(self.matches)
+        return arrival_rate * mean_income * self.match_value_seconds
+
+    def collect_delay(self):
+        """
+        Returns the seconds after the previous collection that the next one should happen.
+        self.reason says why; every change of reason is logged.
+        """
+        accrual = self.accrual_rate()
+        scan_value = self.scan_value_rate()
+        if accrual <= 0:
+            delay, reason = self.max_interval, "no accrual measured"
+        else:
+            delay, reason = scan_value * self.collect_cost() / accrual, "expected value"
+        if delay <= self.min_interval:
+            delay, reason = self.min_interval, "min interval" if reason == "expected value" else reason
+        elif delay >= self.max_interval:
+            delay, reason = self.max_interval, "max interval" if reason == "expected value" else reason
+
+        if reason != self.reason and self.log:
+            self.log(f"Collect every {delay:.0f}s ({reason}): plot earns ${accrual:,.0f}/s, "
+                     f"scanning is worth ${scan_value:,.0f}/s, a collection takes {self.collect_cost():.1f}s")
+        self.reason = reason
+        return delay
+
+    def next_collect_time(self):
+        """
+        The clock time the next collection should start by, collect_delay() after the previous one ended.
+        ActionQueue deadlines are finish-by times, so add the collection's duration when scheduling it.
+        """
+        return self.last_collect_at + self.collect_delay()
+
+
+def load_trace(path):
+    """Loads trace records from a JSONL file."""
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def simulate(trace, interval=None, base_income=0.0, match_value_seconds=600.0, step=1.0):
+    """
+    Replays a trace's matches over its scan time under one collection policy.
+
+    Collections pause scanning, so matches found later in the trace are bought later
+    and start earning later. Cash still on the plot when the trace ends is not counted.
+
+    :param trace: Records from load_trace().
+    :param interval: Fixed seconds between collections, or None for the CashScheduler policy.
+    :param base_income: Plot income ($/s) at the start.
+    :param match_value_seconds: Passed to CashScheduler.
+    :param step: Simulation step in seconds.
+    :return: A dict with 'cash', 'hours', 'cash_per_hour' and 'collections'.
+    """
+    collects = [record["seconds"] for record in trace if record["event"] == "collect"]
+    collect_cost = sum(collects) / len(collects) if collects else 12.0
+    # Matches happen in scan time: recorded time minus the collections before them
+    matches, collected_so_far = [], 0.0
+    for record in trace:
+        if record["event"] == "collect":
+            collected_so_far += record["seconds"]
+        elif record["event"] == "match":
+            matches.append((record["t"] - collected_so_far, record["income"]))
+    total_scan = max((record["t"] for record in trace), default=0.0) - collected_so_far
+
+    now = [0.0]
+    scheduler = CashScheduler(base_income=base_income, match_value_seconds=match_value_seconds,
+                              default_collect_cost=collect_cost, clock=lambda: now[0])
+    scanned, cash, uncollected, collections = 0.0, 0.0, 0.0, 0
+    pending = deque(sorted(matches))
+    while scanned < total_scan:
+        due = scheduler.last_collect_at + (interval if interval is not None else scheduler.collect_delay())
+        if now[0] >= due:
+            uncollected += scheduler.accrual_rate() * collect_cost
+            now[0] += collect_cost
+            cash += uncollected
+            uncollected = 0.0
+            collections += 1
+            scheduler.record_collect(collect_cost)
+            continue
+        uncollected += scheduler.accrual_rate() * step
+        now[0] += step
+        scanned += step
+        while pending and pending[0][0] <= scanned:
+            scheduler.record_match(pending.popleft()[1])
+
+    hours = now[0] / 3600
+    return {"cash": cash, "hours": hours, "cash_per_hour": cash / hours if hours else 0.0, "collections": collections}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare money collection policies on a recorded trace.")
+    parser.add_argument("trace", help="JSONL trace written by CashScheduler")
+    parser.add_argument("--base-income", type=float, default=0.0, help="Plot income ($/s) at the start")
+    parser.add_argument("--match-value-seconds", type=float, default=600.0)
+    parser.add_argument("--intervals", default="60,120,300,600", help="Fixed intervals to compare against")
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace)
+    policies = [(f"every {seconds}s", float(seconds)) for seconds in args.intervals.split(",")]
+    policies.append(("expected value", None))
+    for name, interval in policies:
+        result = simulate(trace, interval, args.base_income, args.match_value_seconds)
+        print(f"{name:>16}: ${result['cash_per_hour']:>14,.0f}/h  ({result['collections']} collections "
+              f"in {result['hours']:.2f}h)")
+
+
+if __name__ == "__main__":
+    main()
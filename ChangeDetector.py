@@ -0,0 +1,89 @@
+import numpy as np
+
+from TextLocator import find_text_regions
+
+
+class ChangeDetector:
+    """
+    Decides whether a screen region changed enough since the last frame to be worth OCR'ing.
+
+    Frames are compared as grayscale images using the mean absolute difference
+    per pixel (0-255). With text_bands on, each text band of the new and the
+    previous frame is compared on its own, at full resolution, and the most
+    changed band decides: a changed income touches a few glyphs, which is lost
+    in the mean over the whole region but not in the mean over its band. Counters record how many frames were let through and
+    how many were skipped, so the threshold can be tuned.
+    """
+
+    def __init__(self, threshold=2.0, decimation=4, text_bands=False):
+        """
+        :param threshold: Mean absolute difference (0-255) above which a frame counts as changed.
+        :param decimation: Only every n-th pixel in each direction is compared. Ignored with text_bands.
+        :param text_bands: Only compare the text bands found by TextLocator.find_text_regions.
+                           Frames without text in either of them count as unchanged.
+        """
+        self.threshold = threshold
+        self.decimation = 1 if text_bands else decimation
+        self.text_bands = text_bands
+        self.processed = 0
+        self.skipped = 0
+        self.last_difference = None
+        self._previous = None
+        self._previous_regions = []
+
+    def _to_gray(self, pixels):
+        sampled = pixels[::self.decimation, ::self.decimation]
+        # Integer luma approximation (0.25 R + 0.625 G + 0.125 B) kept in int16 for the subtraction
+        return (sampled[..., 0].astype(np.int16) * 2 + sampled[..., 1].astype(np.int16) * 5 + sampled[..., 2]) >> 3
+
+    def has_changed(self, pixels):
+        """
+        Compares a region with the one seen on the previous call.
+
+        :param pixels: An RGB uint8 array of the region.
+        :return: True if the region changed (or is the first one seen), False if it is static.
+        """
+        gray = self._to_gray(pixels)
+        regions = find_text_regions(pixels) if self.text_bands else None
+        if self._previous is None or self._previous.shape != gray.shape:
+            self.last_difference = None
+            changed = True
+        else:
+            self.last_difference = self._difference(gray, regions)
+            changed = self.last_difference > self.threshold
+
+        if changed:
+            # Only move the reference on a change, so slow drift still adds up to one
+            self._previous = gray
+            self._previous_regions = regions
+            self.processed += 1
+        else:
+            self.skipped += 1
+        return changed
+
+    def _difference(self, gray, regions):
+        difference = np.abs(gray - self._previous)
+        if not self.text_bands:
+            return float(difference.mean())
+        # The most changed band, checking the bands of both frames so text that appears or disappears counts too
+        return max((float(difference[top:bottom, left:right].mean())
+                    for left, top, right, bottom in regions + self._previous_regions), default=0.0)
+
+    def reset(self):
+        """Forgets the previous frame so the next one is always treated as changed."""
+        self._previous = None
+        self._previous_regions = []
+        self.last_difference = None
+
+    def stats(self):
+        """
+        Returns the skip counters.
+
+        :return: A dict with 'processed', 'skipped' and 'skip_rate' (0.0-1.0).
+        """
+        total = self.processed + self.skipped
+        return {
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "skip_rate": self.skipped / total if total else 0.0,
+        }
@@ -0,0 +1,56 @@
+import time
+
+
+class SystemClock:
+    """Wall-clock time and real sleeping. Used by the bot when it runs for real."""
+
+    def time(self):
+        """Returns the current time in seconds."""
+        return time.time()
+
+    def sleep(self, duration):
+        """Blocks for the given number of seconds."""
+        time.sleep(duration)
+
+    def wait(self, duration, stop_event):
+        """
+        Blocks for up to the given number of seconds, returning as soon as the bot is stopped.
+
+        :param duration: Maximum seconds to wait.
+        :param stop_event: The bot's stop event.
+        :return: True if the wait ended early, False if the full duration passed.
+        """
+        return stop_event.wait(duration)
+
+
+class FakeClock:
+    """
+    A clock that only moves when told to, so timed logic can run instantly offline.
+
+    sleep() returns immediately and advances the clock instead.
+    """
+
+    def __init__(self, start=0.0):
+        """
+        :param start: The initial time in seconds.
+        """
+        self.now = start
+        self.slept = 0.0  # Total virtual time spent sleeping
+
+    def time(self):
+        return self.now
+
+    def sleep(self, duration):
+        self.advance(duration)
+        self.slept += duration
+
+    def wait(self, duration, stop_event):
+        """Sleeps the full duration unless the bot is already stopped."""
+        if stop_event.is_set():
+            return True
+        self.sleep(duration)
+        return False
+
+    def advance(self, duration):
+        """Moves the clock forward without counting it as sleep."""
+        self.now += duration
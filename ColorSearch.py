@@ -0,0 +1,161 @@
+from functools import lru_cache
+import numpy as np
+
+
+def hex_to_rgb(hex_color):
+    """
+    Converts a hex color string into an (r, g, b) tuple.
+
+    :param hex_color: The hex color string (e.g., "D83228" or "#D83228").
+    :return: A tuple of three ints in the range 0-255.
+    """
+    hex_color = hex_color.lstrip("#")
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+class ColorMatcher:
+    """
+    Searches frames for pixels close to one or more target colors.
+
+    A pixel matches a color when the sum of its per-channel absolute differences
+    is within the threshold. Every search is a single pass over the frame through
+    precomputed per-channel lookup tables: a boolean table rejects pixels that are
+    out of range of all colors on some channel, and the exact distances (clipped
+    at threshold + 1 so they sum in uint8) are only computed for what is left.
+    The frame is never copied into a wider (int16/int64) array.
+    """
+
+    BAND_ROWS = 32  # Rows scanned per step when looking for the first match
+
+    def __init__(self, colors, threshold=10):
+        """
+        :param colors: A list of hex strings or (r, g, b) tuples.
+        :param threshold: The tolerance for color matching (0-255).
+        """
+        if not 0 <= threshold <= 255:
+            raise ValueError(f"Threshold must be between 0 and 255, got {threshold}.")
+        self.colors = [hex_to_rgb(c) if isinstance(c, str) else tuple(c) for c in colors]
+        if not self.colors:
+            raise ValueError("At least one color is required.")
+        self.threshold = threshold
+
+        values = np.arange(256, dtype=np.int16)
+        targets = np.array(self.colors, dtype=np.int16)
+        # luts[color, channel, value] = min(|value - color[channel]|, cap)
+        distances = np.abs(values[None, None, :] - targets[:, :, None])
+        if 3 * (threshold + 1) <= 255:
+            self.luts = np.minimum(distances, threshold + 1).astype(np.uint8)
+        else:
+            self.luts = distances.astype(np.uint16)
+        # candidates[channel, value]: the value is within the threshold of some color on that channel.
+        # A pixel can only match if all three of its channels are candidates.
+        self.candidates = (distances <= threshold).any(axis=0)
+
+    @staticmethod
+    def _crop(frame, roi):
+        if roi is None:
+            return frame, 0, 0
+        left, top, right, bottom = roi
+        return frame[top:bottom, left:right], left, top
+
+    def _match(self, pixels):
+        """Returns a boolean mask of the pixels that match any of the colors."""
+        red, green, blue = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+        mask = self.candidates[0][red]
+        mask &= self.candidates[1][green]
+        mask &= self.candidates[2][blue]
+        if not mask.any():
+            return mask
+
+        # Only the few candidate pixels get the exact distance check
+        ys, xs = np.nonzero(mask)
+        candidate_pixels = pixels[ys, xs]
+        exact = np.zeros(len(ys), dtype=bool)
+        for lut in self.luts:
+            distance = lut[0][candidate_pixels[:, 0]] + lut[1][candidate_pixels[:, 1]] + lut[2][candidate_pixels[:, 2]]
+            exact |= distance <= self.threshold
+        mask[ys[~exact], xs[~exact]] = False
+        return mask
+
+    def find_first(self, frame, roi=None):
+        """
+        Finds the first matching pixel in row-major order, stopping at the first
+        band of rows that contains one.
+
+        :param frame: An RGB uint8 frame of shape (height, width, 3).
+        :param roi: Optional (left, top, right, bottom) region of interest in frame coordinates.
+        :return: A tuple (x, y) in frame coordinates, or None if not found.
+        """
+        pixels, left, top = self._crop(frame, roi)
+        for start in range(0, pixels.shape[0], self.BAND_ROWS):
+            mask = self._match(pixels[start:start + self.BAND_ROWS])
+            if mask.any():
+                y, x = divmod(int(mask.argmax()), mask.shape[1])
+                return left + x, top + start + y
+        return None
+
+    def find_all(self, frame, roi=None):
+        """
+        Finds every matching pixel.
+
+        :param frame: An RGB uint8 frame of shape (height, width, 3).
+        :param roi: Optional (left, top, right, bottom) region of interest in frame coordinates.
+        :return: A boolean mask the size of the ROI (or frame) with True for matching pixels.
+        """
+        pixels, _, _ = self._crop(frame, roi)
+        return self._match(pixels)
+
+
+@lru_cache(maxsize=32)
+def get_matcher(colors, threshold=10):
+    """
+    Returns a cached ColorMatcher so repeated searches don't rebuild the lookup tables.
+
+    :param colors: A tuple of hex strings or (r, g, b) tuples.
+    :param threshold: The tolerance for color matching (0-255).
+    """
+    return ColorMatcher(colors, threshold)
+
+
+def _legacy_find_color(img_np, hex_color, threshold=10):
+    """The original WindowManager.find_color search, kept as the benchmark baseline."""
+    r, g, b = hex_to_rgb(hex_color)
+    target_color = np.array([r, g, b])
+    diff = np.abs(img_np - target_color)
+    distance = np.sum(diff, axis=2)
+    matching_pixels = np.where(distance <= threshold)
+    if matching_pixels[0].size > 0:
+        y, x = matching_pixels[0][0], matching_pixels[1][0]
+        return int(x), int(y)
+    return None
+
+
+if __name__ == "__main__":
+    # Micro-benchmark against the original implementation on 800x600 frames.
+    import timeit
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 200, size=(600, 800, 3), dtype=np.uint8)
+    late_hit = frame.copy()
+    late_hit[450, 300] = hex_to_rgb("D83228")
+    early_hit = frame.copy()
+    early_hit[20, 300] = hex_to_rgb("D83228")
+    matcher = get_matcher(("D83228",), 10)
+    multi = get_matcher(("D83228", "2FA8F0", "FFFFFF"), 10)
+
+    cases = [
+        ("legacy, no match", lambda: _legacy_find_color(frame, "D83228")),
+        ("find_first, no match", lambda: matcher.find_first(frame)),
+        ("legacy, match at row 450", lambda: _legacy_find_color(late_hit, "D83228")),
+        ("find_first, match at row 450", lambda: matcher.find_first(late_hit)),
+        ("find_first, match at row 20", lambda: matcher.find_first(early_hit)),
+        ("find_first, 3 colors, no match", lambda: multi.find_first(frame)),
+        ("find_first, ROI 200x200", lambda: matcher.find_first(frame, roi=(300, 200, 500, 400))),
+        ("find_all mask", lambda: matcher.find_all(frame)),
+    ]
+    assert matcher.find_first(late_hit) == _legacy_find_color(late_hit, "D83228") == (300, 450)
+    assert multi.find_first(frame) is None
+    for name, func in cases:
+        runs = 20
+        seconds = min(timeit.repeat(func, number=runs, repeat=3)) / runs
+        print(f"{name:<34} {seconds * 1000:8.2f} ms")
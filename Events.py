@@ -1,6 +1,90 @@
+import itertools
+import threading
+import time
+import traceback
+from collections import deque
+
+
+class _Subscriber:
+    """One subscriber's bounded queue of pending events. The oldest event is dropped when it is full."""
+
+    def __init__(self, topic, callback, mode, max_queue, with_time=False):
+        self.topic = topic
+        self.callback = callback
+        self.mode = mode
+        self.max_queue = max_queue
+        self.with_time = with_time  # Pass the emit time to the callback as emitted_at
+        self.items = deque()
+        self.ready = threading.Condition()
+        self.delivered = 0
+        self.failed = 0  # Deliveries where the callback raised
+        self.dropped = 0
+
+    def push(self, sequence, emitted_at, args, kwargs):
+        with self.ready:
+            if len(self.items) >= self.max_queue:
+                self.items.popleft()
+                self.dropped += 1
+            self.items.append((sequence, emitted_at, args, kwargs))
+            self.ready.notify()
+
+    def next_sequence(self):
+        """Returns the sequence number of the oldest pending event, or None if there is none."""
+        with self.ready:
+            return self.items[0][0] if self.items else None
+
+    def pop(self):
+        with self.ready:
+            return self.items.popleft()
+
+    def drain(self, limit=None):
+        """Delivers up to limit pending events on the calling thread. Returns how many were delivered."""
+        with self.ready:
+            count = len(self.items) if limit is None else min(limit, len(self.items))
+            batch = [self.items.popleft() for _ in range(count)]
+        for _, emitted_at, args, kwargs in batch:
+            self.deliver(emitted_at, args, kwargs)
+        return count
+
+    def deliver(self, emitted_at, args, kwargs):
+        if self.with_time:
+            kwargs = dict(kwargs, emitted_at=emitted_at)
+        try:
+            self.callback(*args, **kwargs)
+        except Exception:
+            # A broken subscriber must not take the publisher down with it
+            print(f"Error in '{self.topic}' subscriber {getattr(self.callback, '__name__', self.callback)}:")
+            traceback.print_exc()
+            self.failed += 1
+        else:
+            self.delivered += 1
+
+    def run(self):
+        while True:
+            with self.ready:
+                self.ready.wait_for(lambda: self.items)
+            self.drain()
+
+
 class Events:
+    """
+    Process-wide event bus.
+
+    emit() only enqueues and returns. Each subscriber has its own bounded queue
+    and is delivered to in one of three ways:
+        "thread": on a worker thread of its own, so a slow subscriber only delays itself.
+        "tk":     in batches on the Tk thread, via after(), once bind_tk() has been called.
+                  Use this for anything that touches widgets. Events reach Tk subscribers
+                  in the order they were emitted, across all topics.
+        "sync":   straight away on the emitting thread, for cheap, thread-safe callbacks
+                  such as printing in headless tools.
+    """
     _instance = None
 
+    MAX_QUEUE = 1000  # Pending events per subscriber before the oldest are dropped
+    TK_INTERVAL_MS = 50  # How often Tk subscribers are drained
+    TK_BATCH = 1000  # Events delivered per drain, so the GUI stays responsive
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Events, cls).__new__(cls)
@@ -9,17 +93,113 @@ class Events:
     def __init__(self):
         if not hasattr(self, '_subscribers'):
             self._subscribers = {}
+            self._tk_subscribers = []
+            self._all_subscribers = []  # subscribe_all(); called with the topic first
+            self._tk_root = None
+            self._lock = threading.Lock()
+            self._sequence = itertools.count()  # Orders events across topics for Tk delivery
+
+    def subscribe(self, event_name, callback, mode="thread", max_queue=MAX_QUEUE, with_time=False):
+        """
+        Registers a callback for an event.
+
+        :param event_name: The topic, e.g. "debug".
+        :param callback: Called with the arguments passed to emit().
+        :param mode: "thread", "tk" or "sync"; see the class docstring.
+        :param max_queue: Pending events kept before the oldest are dropped.
+        :param with_time: If True, the callback also gets emitted_at, the time.time() of the emit() call,
+                          since queued events are delivered later.
+        """
+        if mode not in ("thread", "tk", "sync"):
+            raise ValueError(f"Unknown subscriber mode '{mode}'.")
+        subscriber = _Subscriber(event_name, callback, mode, max_queue, with_time)
+        with self._lock:
+            self._subscribers.setdefault(event_name, []).append(subscriber)
+            if mode == "tk":
+                self._tk_subscribers.append(subscriber)
+        if mode == "thread":
+            threading.Thread(target=subscriber.run, name=f"Events-{event_name}", daemon=True).start()
+
+    def subscribe_all(self, callback, mode="thread", max_queue=MAX_QUEUE):
+        """
+        Registers a callback for every event, e.g. for recording them.
 
-    def subscribe(self, event_name, callback):
-        if event_name not in self._subscribers:
-            self._subscribers[event_name] = []
-        self._subscribers[event_name].append(callback)
+        :param callback: Called with the topic followed by the arguments passed to emit().
+        :param mode: "thread", "tk" or "sync"; see the class docstring.
+        :param max_queue: Pending events kept before the oldest are dropped.
+        """
+        if mode not in ("thread", "tk", "sync"):
+            raise ValueError(f"Unknown subscriber mode '{mode}'.")
+        subscriber = _Subscriber("*", callback, mode, max_queue)
+        with self._lock:
+            self._all_subscribers.append(subscriber)
+            if mode == "tk":
+                self._tk_subscribers.append(subscriber)
+        if mode == "thread":
+            threading.Thread(target=subscriber.run, name="Events-all", daemon=True).start()
+
+    def bind_tk(self, root):
+        """
+        Starts draining "tk" subscribers on root's thread. Must be called from that thread.
+
+        :param root: The Tk (or CTk) root window.
+        """
+        self._tk_root = root
+        self._drain_tk()
+
+    def _drain_tk(self):
+        # Always deliver the oldest pending event of any Tk subscriber, so lines from different topics stay in order
+        for _ in range(self.TK_BATCH):
+            oldest, oldest_sequence = None, None
+            for subscriber in self._tk_subscribers:
+                sequence = subscriber.next_sequence()
+                if sequence is not None and (oldest_sequence is None or sequence < oldest_sequence):
+                    oldest, oldest_sequence = subscriber, sequence
+            if oldest is None:
+                break
+            _, emitted_at, args, kwargs = oldest.pop()
+            oldest.deliver(emitted_at, args, kwargs)
+        try:
+            self._tk_root.after(self.TK_INTERVAL_MS, self._drain_tk)
+        except Exception:
+            pass  # The window was destroyed
 
     def emit(self, event_name, *args, **kwargs):
-        if event_name in self._subscribers:
-            for callback in self._subscribers[event_name]:
-                callback(*args, **kwargs)
-    
+        sequence = next(self._sequence)
+        emitted_at = time.time()
+        for subscriber in self._subscribers.get(event_name, ()):
+            if subscriber.mode == "sync":
+                subscriber.deliver(emitted_at, args, kwargs)
+            else:
+                subscriber.push(sequence, emitted_at, args, kwargs)
+        for subscriber in self._all_subscribers:
+            if subscriber.mode == "sync":
+                subscriber.deliver(emitted_at, (event_name,) + args, kwargs)
+            else:
+                subscriber.push(sequence, emitted_at, (event_name,) + args, kwargs)
+
+    def queue_stats(self):
+        """
+        Returns the queue depth and drop count of every topic, summed over its subscribers.
+        Subscribers registered with subscribe_all() are listed under the topic "*".
+
+        :return: {topic: {"depth": pending events, "dropped": events dropped, "delivered": events delivered,
+                          "failed": deliveries where the callback raised}}
+        """
+        with self._lock:
+            groups = list(self._subscribers.items())
+            if self._all_subscribers:
+                groups.append(("*", list(self._all_subscribers)))
+        stats = {}
+        for topic, subscribers in groups:
+            stats[topic] = {
+                "depth": sum(len(subscriber.items) for subscriber in subscribers),
+                "dropped": sum(subscriber.dropped for subscriber in subscribers),
+                "delivered": sum(subscriber.delivered for subscriber in subscribers),
+                "failed": sum(subscriber.failed for subscriber in subscribers),
+            }
+        return stats
+
     def change_status(self, message, color="gray"):
         self.emit("status_change", message, color)
     
@@ -36,5 +216,20 @@ class Events:
     def log(self, message):
         self.emit("log", message)
 
-    def success(self, message):
-        self.emit("success", message)
\ No newline at end of file
+    def success(self, message, image=None):
+        """
+        Emits a success message, e.g. a bought brainrot.
+
+        :param message: The message.
+        :param image: Optional Snapshot to attach when the message is sent to Discord.
+        """
+        self.emit("success", message, image=image)
+
+    def stats(self, message, summary):
+        """
+        Emits a performance summary.
+
+        :param message: A one-line, human-readable version of the summary.
+        :param summary: The structured data, e.g. StageTimings.summary().
+        """
+        self.emit("stats", message, summary)
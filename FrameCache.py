@@ -0,0 +1,68 @@
+import time
+from FrameSource import FrameSource
+
+
+class FrameCache(FrameSource):
+    """
+    Wraps a FrameSource so that every read within a short freshness window
+    is served from the same captured frame.
+
+    Pixel probes, color searches and OCR crops that happen within one scan tick
+    then share a single grab instead of each hitting the screen again.
+    """
+
+    def __init__(self, source, ttl=0.05, clock=time.monotonic):
+        """
+        :param source: The FrameSource to capture from on a cache miss.
+        :param ttl: How long (in seconds) a captured frame stays valid.
+        :param clock: Monotonic time function, replaceable for offline runs.
+        """
+        self.source = source
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._frame = None
+        self._captured_at = None
+
+    def open(self):
+        self.source.open()
+        return self
+
+    def grab(self):
+        now = self.clock()
+        if self._frame is not None and now - self._captured_at < self.ttl:
+            self.hits += 1
+            return self._frame
+
+        self._frame = self.source.grab()
+        self._captured_at = now
+        self.misses += 1
+        return self._frame
+
+    def invalidate(self):
+        """Forces the next grab to capture a new frame."""
+        self._frame = None
+        self._captured_at = None
+
+    def reset_stats(self):
+        """Resets the hit/miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns a summary of how many grabs the cache has saved.
+
+        :return: A dict with 'hits', 'misses' and 'hit_rate' (0.0-1.0).
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        self.invalidate()
+        self.source.close()
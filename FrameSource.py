@@ -0,0 +1,210 @@
+import os
+import numpy as np
+from PIL import Image
+
+try:
+    import win32con
+    import win32gui
+    import win32ui
+except ImportError:  # Not on Windows; only the file-backed sources are usable.
+    win32con = win32gui = win32ui = None
+
+
+class EndOfRecording(Exception):
+    """Raised by grab() of a recorded source that has no more frames."""
+
+
+class FrameSource:
+    """
+    Base class for anything that produces frames of the game window's client area.
+
+    Frames are RGB NumPy arrays of shape (height, width, 3) and dtype uint8. Sources
+    are allowed to reuse the same buffer between grabs, so a returned frame is only
+    valid until the next call to grab(); copy it if it needs to live longer.
+    """
+
+    def open(self):
+        """Acquires whatever resources the source needs. Safe to call more than once."""
+        return self
+
+    def grab(self):
+        """
+        Returns the current frame of the client area.
+        Recorded sources raise EndOfRecording once they have no more frames to play.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Releases the resources acquired by open()."""
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ScreenFrameSource(FrameSource):
+    """
+    Captures the client area of a window with a persistent GDI session.
+
+    The screen DC, the memory DC and the target bitmap are created once and reused
+    for every grab, instead of being set up and torn down on each ImageGrab call.
+    """
+
+    def __init__(self, hwnd):
+        """
+        :param hwnd: The handle to the window whose client area should be captured.
+        """
+        if win32gui is None:
+            raise RuntimeError("ScreenFrameSource requires pywin32 (Windows only).")
+        self.hwnd = hwnd
+        self._screen_dc_handle = None
+        self._screen_dc = None
+        self._memory_dc = None
+        self._bitmap = None
+        self._size = None
+        self._buffer = None
+
+    def open(self):
+        if self._screen_dc is None:
+            self._screen_dc_handle = win32gui.GetWindowDC(0)
+            self._screen_dc = win32ui.CreateDCFromHandle(self._screen_dc_handle)
+            self._memory_dc = self._screen_dc.CreateCompatibleDC()
+        return self
+
+    def _ensure_bitmap(self, width, height):
+        """(Re)creates the capture bitmap and output buffer when the client size changes."""
+        if self._size == (width, height):
+            return
+        if self._bitmap is not None:
+            win32gui.DeleteObject(self._bitmap.GetHandle())
+        self._bitmap = win32ui.CreateBitmap()
+        self._bitmap.CreateCompatibleBitmap(self._screen_dc, width, height)
+        self._memory_dc.SelectObject(self._bitmap)
+        self._buffer = np.empty((height, width, 3), dtype=np.uint8)
+        self._size = (width, height)
+
+    def grab(self):
+        self.open()
+        left, top, right, bottom = win32gui.GetClientRect(self.hwnd)
+        width, height = right - left, bottom - top
+        screen_left, screen_top = win32gui.ClientToScreen(self.hwnd, (left, top))
+        self._ensure_bitmap(width, height)
+
+        self._memory_dc.BitBlt((0, 0), (width, height), self._screen_dc, (screen_left, screen_top), win32con.SRCCOPY)
+        raw = np.frombuffer(self._bitmap.GetBitmapBits(True), dtype=np.uint8).reshape(height, width, 4)
+
+        # GDI hands back BGRA; reorder into the reused RGB buffer
+        np.copyto(self._buffer, raw[:, :, 2::-1])
+        return self._buffer
+
+    def close(self):
+        if self._bitmap is not None:
+            win32gui.DeleteObject(self._bitmap.GetHandle())
+            self._bitmap = None
+        if self._memory_dc is not None:
+            self._memory_dc.DeleteDC()
+            self._memory_dc = None
+        if self._screen_dc is not None:
+            self._screen_dc.DeleteDC()
+            self._screen_dc = None
+        if self._screen_dc_handle is not None:
+            win32gui.ReleaseDC(0, self._screen_dc_handle)
+            self._screen_dc_handle = None
+        self._size = None
+        self._buffer = None
+
+
+def load_frame(path, out=None):
+    """
+    Loads an image file as an RGB frame.
+
+    :param path: Path to the image file.
+    :param out: Optional array to decode into. It is reused if its shape matches.
+    :return: The frame as a uint8 array of shape (height, width, 3).
+    """
+    with Image.open(path) as image:
+        frame = np.asarray(image.convert("RGB"))
+    if out is not None and out.shape == frame.shape:
+        np.copyto(out, frame)
+        return out
+    return frame.copy()
+
+
+class FileFrameSource(FrameSource):
+    """Serves the same recorded frame on every grab."""
+
+    def __init__(self, path):
+        """
+        :param path: Path to a screenshot of the client area.
+        """
+        self.path = path
+        self._frame = None
+
+    def open(self):
+        if self._frame is None:
+            self._frame = load_frame(self.path)
+        return self
+
+    def grab(self):
+        self.open()
+        return self._frame
+
+    def close(self):
+        self._frame = None
+
+
+class DirectoryFrameSource(FrameSource):
+    """Plays back a directory of recorded frames in filename order."""
+
+    EXTENSIONS = (".png", ".bmp", ".jpg", ".jpeg")
+
+    def __init__(self, directory, loop=True, preload=False):
+        """
+        :param directory: Directory containing one image per frame.
+        :param loop: Start over from the first frame after the last one.
+                     If False, grab() raises EndOfRecording once the frames run out.
+        :param preload: Decode every frame up front so playback does not pay for
+                        image decoding (useful when benchmarking the rest of the pipeline).
+        """
+        self.directory = directory
+        self.loop = loop
+        self.preload = preload
+        self.paths = sorted(
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.lower().endswith(self.EXTENSIONS)
+        )
+        if not self.paths:
+            raise ValueError(f"No frames found in '{directory}'.")
+        self.index = 0
+        self._frames = None
+        self._buffer = None
+
+    def open(self):
+        if self.preload and self._frames is None:
+            self._frames = [load_frame(path) for path in self.paths]
+        return self
+
+    def __len__(self):
+        return len(self.paths)
+
+    def grab(self):
+        self.open()
+        if self.index >= len(self.paths):
+            if not self.loop:
+                raise EndOfRecording("No more recorded frames.")
+            self.index = 0
+
+        if self._frames is not None:
+            frame = self._frames[self.index]
+        else:
+            self._buffer = load_frame(self.paths[self.index], out=self._buffer)
+            frame = self._buffer
+        self.index += 1
+        return frame
+
+    def close(self):
+        self._frames = None
+        self._buffer = None
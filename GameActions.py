@@ -1,57 +1,200 @@
-import re
-from time import sleep
 from Events import Events
-from Helper import human_readable_to_long
-import time
+from NameplateParser import ALL_RARITIES, NameplateParser
 import random
+import time
+from ChangeDetector import ChangeDetector
+from Routes import RouteBook
+from Clock import SystemClock
+from Metrics import StageTimings, format_summary
+from ScanPipeline import ScanPipeline
+from Snapshot import Snapshot
 
 class GameActions:
-    def __init__(self, window_manager, input_manager, stop_event, action_queue):
+    SCAN_STAGES = ("capture", "ocr", "parse", "decide", "input", "sleep")
+    STATS_INTERVAL = 60  # Seconds between scan latency summaries in the log
+    SETTLE_POLL = 0.05  # Seconds between checks in wait_until(); each check grabs a fresh frame
+    SETTLE_QUIET = 0.15  # Seconds the screen must stay unchanged to count as settled
+    RESPAWN_TIMEOUT = 5.0  # The old fixed post-reset sleep; a reset never waits longer than this
+    RESPAWN_MIN = 1.0  # Seconds for the reset menu to fade out before the respawn probes are trusted
+    RESPAWN_PROBES = ((70, 397), (730, 400))  # Plot border pixels, also used to decide whether to walk back
+    RESPAWN_PROBE_DELTA = 40  # Channel difference at a probe that counts as the view having changed
+    COLLECT_ESTIMATE = 12.0  # Seconds a reset and collect walk take, until the action queue has measured it
+
+    def __init__(self, window_manager, input_manager, stop_event, action_queue, clock=None, routes=None):
         self.window_manager = window_manager
         self.input_manager = input_manager
         self.stop_event = stop_event
         self.plot_side_right = None  # Will be set based on camera alignment
         self.action_queue = action_queue
+        self.clock = clock or SystemClock()  # Replaced by a FakeClock when replaying offline
+        self.routes = routes or RouteBook()  # Movement routes from data/routes.json, compiled once
         self.status_update = Events().change_status
         self.tooltip = Events().tooltip
         self.debug = Events().debug
         self.log = Events().log
         self.success = Events().success
-        self.ALL_RARITIES = [
-        "common", "rare", "epic", "legendary", 
-        "mythic", "brainrot", "secret"
-    ]
+        self.stats = Events().stats
+        self.change_detector = None
+        self.cash_scheduler = None  # Optional CashScheduler told about every buy
+        self.snapshot_settings = None  # Snapshot options to attach the nameplate to success messages, or None
+        self.stage_timings = StageTimings(self.SCAN_STAGES)
+        self.ALL_RARITIES = ALL_RARITIES
+        self.nameplate_parser = NameplateParser(self.ALL_RARITIES)
         
 
     def safe_sleep(self, duration):
         """
-        Sleeps for the specified duration, ensuring the window is still active.
+        Sleeps for the specified duration, raising as soon as the bot is stopped.
+
+        Args:
+            duration (float): Seconds to sleep.
         """
         if self.stop_event.is_set():
             raise Exception("Bot stopped by user.")
-        sleep(duration)
+        self.clock.wait(duration, self.stop_event)
+        if self.stop_event.is_set():
+            raise Exception("Bot stopped by user.")
+
+    def run_script(self, script):
+        """
+        Sends an InputScript as one timed batch, waiting for the screen at its settle steps.
+
+        Args:
+            script (InputScript): The movement to perform.
+        """
+        self.input_manager.run_script(script, self.stop_event, settle=self.wait_settled)
         if self.stop_event.is_set():
             raise Exception("Bot stopped by user.")
 
+    def walk(self, route):
+        """
+        Walks a route from data/routes.json, mirrored for the side our plot is on.
+
+        Args:
+            route (str): The route name.
+        """
+        self.run_script(self.routes.plan(route, self.plot_side_right))
+
+    def wait_until(self, predicate, timeout, poll=SETTLE_POLL, description=None):
+        """
+        Polls a predicate until it is satisfied, instead of sleeping for a fixed time.
+
+        Args:
+            predicate (callable): Called with no arguments; should be cheap, e.g. a pixel or
+                                    region check on the cached frame.
+            timeout (float): Seconds to wait at most; the old fixed sleep is a safe value.
+            poll (float, optional): Seconds between checks. Defaults to SETTLE_POLL.
+            description (str, optional): Logged if the wait times out.
+
+        Returns:
+            bool: True if the predicate was satisfied, False if the timeout passed first.
+        """
+        deadline = self.clock.time() + timeout
+        while True:
+            if predicate():
+                return True
+            remaining = deadline - self.clock.time()
+            if remaining <= 0:
+                if description:
+                    self.debug(f"Timed out after {timeout}s waiting for {description}")
+                return False
+            self.safe_sleep(min(poll, remaining))
+
+    def screen_settled(self, quiet=SETTLE_QUIET, bounding_box=None, threshold=2.0, after_change=False):
+        """
+        Builds a wait_until predicate that is satisfied once the screen stops moving.
+
+        Args:
+            quiet (float, optional): Seconds the region must stay unchanged. Defaults to SETTLE_QUIET.
+            bounding_box (tuple, optional): Client-area region to watch. Defaults to the whole window.
+            threshold (float, optional): Mean absolute pixel difference that counts as movement.
+            after_change (bool, optional): Only count as settled after the region changed at least
+                                    once, e.g. to wait for a respawn to start and finish.
+
+        Returns:
+            callable: The predicate.
+        """
+        detector = ChangeDetector(threshold=threshold)
+        state = {"changed": not after_change, "still_since": None}
+
+        def settled():
+            now = self.clock.time()
+            # Bypass the frame cache: a cached frame would compare as unchanged and end the wait early
+            if detector.has_changed(self.window_manager.grab_frame(bounding_box, fresh=True)):
+                if detector.last_difference is not None:
+                    state["changed"] = True
+                state["still_since"] = now
+                return False
+            return state["changed"] and now - state["still_since"] >= quiet
+
+        return settled
+
+    def wait_settled(self, timeout, quiet=SETTLE_QUIET, after_change=False):
+        """Waits until the screen stops moving, or for at most timeout seconds."""
+        return self.wait_until(self.screen_settled(quiet, after_change=after_change), timeout)
+
+    def _log_cache_stats(self):
+        """Logs how many screen grabs and OCR calls the caches have saved so far."""
+        frame_cache = getattr(self.window_manager, "frame_cache", None)
+        if frame_cache is not None:
+            stats = frame_cache.stats()
+            self.debug(f"Frame cache: {stats['hits']} hits / {stats['misses']} grabs ({stats['hit_rate']:.0%} saved)")
+        ocr_cache = getattr(self.window_manager, "ocr_cache", None)
+        if ocr_cache is not None:
+            stats = ocr_cache.stats()
+            self.debug(f"OCR cache: {stats['hits']} hits / {stats['misses']} OCR calls ({stats['hit_rate']:.0%} saved)")
+        if self.change_detector is not None:
+            stats = self.change_detector.stats()
+            average_ocr = self.stage_timings.histograms["ocr"].summary()["mean"] or 0.0
+            self.debug(
+                f"Change gate: {stats['skipped']} frames skipped / {stats['processed']} OCR'd "
+                f"({stats['skip_rate']:.0%} skipped, ~{stats['skipped'] * average_ocr:.1f}s of OCR saved)"
+            )
+
+    def _emit_stage_stats(self):
+        """Publishes the per-stage scan latency percentiles, and the event topics that dropped or failed messages."""
+        summary = self.stage_timings.summary()
+        self.stats(f"Scan latency: {format_summary(summary)}", summary)
+        backlog = {topic: stats for topic, stats in Events().queue_stats().items() if stats["dropped"] or stats["failed"]}
+        if backlog:
+            self.debug("Event queues losing messages: " + ", ".join(
+                f"{topic} {stats['dropped']} dropped, {stats['failed']} failed ({stats['depth']} waiting)"
+                for topic, stats in backlog.items()))
+
     def reset_bot(self, no_drag=False):
         self.status_update("Resetting character...")
+        # The camera stays where the character died until it respawns, so the probes only change on respawn
+        before_reset = self._respawn_probes()
         self.input_manager.key_press('esc')
         self.safe_sleep(0.3)
         self.input_manager.key_press('r')
         self.safe_sleep(0.3)
         self.input_manager.key_press('enter')
-        self.safe_sleep(5)
+        # Continue as soon as the view cuts to the spawn point, never later than the old fixed 5 seconds.
+        # If the character was reset at the spawn point nothing changes and this waits the full 5 seconds.
+        self.safe_sleep(self.RESPAWN_MIN)
+        self.wait_until(lambda: self._probes_changed(before_reset, self._respawn_probes()),
+                        timeout=self.RESPAWN_TIMEOUT - self.RESPAWN_MIN, description="respawn")
         # if is red
-        r, g, b = self.window_manager.get_color_at_pixel(70, 397)
-        r2, g2, b2 = self.window_manager.get_color_at_pixel(730, 400) 
+        (r, g, b), (r2, g2, b2) = self._respawn_probes()
         if not no_drag:
             self.input_manager.drag_mouse(100, 100, 100, 500, button='right')
-        self.safe_sleep(0.5)
+        self.wait_settled(0.5)
         self.debug(f"red1: ({r}) red2: ({r2})")
         if not (r > 120) and not (r2 > 120) and self.plot_side_right is not None:
-            self.input_manager.key_press(self.plot_side_right and 'left' or 'right', duration=0.75)
+            self.walk("return_to_plot")
 
 
+    def _respawn_probes(self):
+        """Reads the RESPAWN_PROBES pixels from a freshly captured frame."""
+        frame = self.window_manager.grab_frame(fresh=True)
+        return [tuple(int(channel) for channel in frame[y, x]) for x, y in self.RESPAWN_PROBES]
+
+    def _probes_changed(self, before, after):
+        return any(abs(a - b) > self.RESPAWN_PROBE_DELTA
+                   for pixel_before, pixel_after in zip(before, after)
+                   for a, b in zip(pixel_before, pixel_after))
+
     def align_camera(self):
         """
         Drag right click down then use OCR to find whether "Cash Multi" is on right or left side of the screen.
@@ -61,11 +204,11 @@ class GameActions:
         self.safe_sleep(0.5)
         self.status_update("Aligning camera...")
         self.input_manager.scroll(clicks=1000)
-        self.safe_sleep(0.5)
+        self.wait_settled(0.5)
         self.input_manager.scroll(clicks=-9, interval=0.1)
-        self.safe_sleep(0.5)
+        self.wait_settled(0.5)
         self.reset_bot(no_drag=True)
-        self.safe_sleep(0.5)
+        self.wait_settled(0.5)
         # find if the word "CASH" is on the right or left side of the screen
         def ocr_multi():
             bounding_box = (55, 188, 731, 380)
@@ -102,11 +245,7 @@ class GameActions:
         """
         self.reset_bot()
         self.status_update("Collecting money...")
-        hold_time = 1.8
-        if self.plot_side_right:
-            self.input_manager.key_press('d', duration=hold_time)
-        else:
-            self.input_manager.key_press('a', duration=hold_time)
+        self.walk("lock_base")
     
     def collect_money(self):
         """
@@ -114,27 +253,30 @@ class GameActions:
         """
         self.reset_bot()
         self.status_update("Collecting money...")
-        first_to_last_time = 1
-        self.input_manager.key_press(self.plot_side_right and 'd' or 'a', duration=0.55)
-        self.safe_sleep(0.5)
-        self.input_manager.key_press('w', duration=0.4)
-        self.safe_sleep(0.4)
-        self.input_manager.key_press(self.plot_side_right and 'd' or 'a', duration=first_to_last_time)
-        self.safe_sleep(0.5)
-        self.input_manager.key_press('s', duration=0.7)
-        self.safe_sleep(0.5)
-        self.input_manager.key_press(self.plot_side_right and 'a' or 'd', duration=first_to_last_time)
-        self.safe_sleep(0.5)
+        self.walk("collect_money")
 
-    def scan_npcs(self, min_rarity=None, min_income=100, stop_time=None):
+    def scan_npcs(self, min_rarity=None, min_income=100, stop_time=None, skip_static_frames=False, change_threshold=2.0,
+                  pipelined=False, capture_interval=0.05, cadence=None):
         """
         Scan for NPCs and accept them based on rarity and income.
 
+        Returns after stop_time, or as soon as the action queue has work that should run
+        (urgent actions right away, deferrable ones at a moment when nothing is on screen).
+
         Args:
             rarities (list, optional): A list of desired rarities (e.g., ["Legendary", "Brainrot God"]).
                                     If None or empty, any rarity is accepted. Defaults to None.
             min_income (int, optional): The minimum income to accept. Defaults to 100.
             stop_time (int, optional): Time in seconds to run the scan for. Defaults to None.
+            skip_static_frames (bool, optional): Only run OCR when a text band of the scan region changed
+                                    since the last OCR'd frame, or the last read was partial. Defaults to False.
+            change_threshold (float, optional): Mean absolute pixel difference (0-255) within a text band
+                                    that counts as a change when skip_static_frames is on. Defaults to 2.0.
+            pipelined (bool, optional): Capture and OCR on background workers while this thread only
+                                    decides and presses keys. Defaults to False.
+            capture_interval (float, optional): Seconds between captures in pipelined mode. Defaults to 0.05.
+            cadence (AdaptiveCadence, optional): Chooses the wait between ticks. If None, every tick
+                                    waits a fixed 0.2 seconds. Defaults to None.
         """
         if not min_rarity or min_rarity == "N/A":
             target_rarities = None
@@ -156,88 +298,227 @@ class GameActions:
                 self.debug(f"Warning: Minimum rarity '{min_rarity}' is not valid. Defaulting to accept all rarities.")
                 target_rarities = None
 
-        start_time = time.time()
+        start_time = self.clock.time()
         self.reset_bot()
         self.status_update("Scanning NPCs...")
-        hold_time = 1.7
-        if self.plot_side_right:
-            self.input_manager.key_press('a', duration=hold_time)
-        else:
-            self.input_manager.key_press('d', duration=hold_time)
+        self.walk("walk_to_scan")
 
         self.input_manager.move_mouse(13, 65)
         self.safe_sleep(0.5)
-        last_mouse_move_time = time.time()
+        last_mouse_move_time = self.clock.time()
+
+        if skip_static_frames:
+            self.change_detector = ChangeDetector(threshold=change_threshold, text_bands=True)
+        bounding_box = (148, 95, 610, 514)
+
+        if pipelined:
+            self._scan_pipelined(bounding_box, min_income, target_rarities, stop_time, start_time, capture_interval)
+            return
 
+        last_stats_time = self.clock.time()
+        previous_nameplate = None
+        partial = False
         while True:
             # Periodically move the mouse to prevent being idle
-            if time.time() - last_mouse_move_time >= 60:
+            if self.clock.time() - last_mouse_move_time >= 60:
                 x_coord = random.randint(12, 13)  # Random number between 12 and 13
                 self.input_manager.click(x_coord, 65)
-                last_mouse_move_time = time.time()
+                last_mouse_move_time = self.clock.time()
 
-            if stop_time is not None and time.time() - start_time >= stop_time:
+            if self.clock.time() - last_stats_time >= self.STATS_INTERVAL:
+                self._emit_stage_stats()
+                last_stats_time = self.clock.time()
+
+            if stop_time is not None and self.clock.time() - start_time >= stop_time:
                 self.debug(f"Scan stopped after {stop_time} seconds")
+                self._log_cache_stats()
+                self._emit_stage_stats()
                 break
 
-            bounding_box = (148, 95, 610, 514)
-            ocr_results_raw, result_object = self.window_manager.get_words_in_bounding_box(bounding_box)
-            
-            # --- Initialize variables for this scan ---
-            found_income = None
-            income_str = "N/A"
-            found_rarity = None
-
-            ## CHANGED ## Process OCR results word-by-word.
-            for word, _ in ocr_results_raw:
-                # Check 1: Is this word an income string?
-                income_match = re.search(r"\$(.+)/s", word)
-                if income_match:
-                    try:
-                        income_str = income_match.group(1)
-                        found_income = human_readable_to_long(income_str)
-                    except (ValueError, TypeError) as e:
-                        self.debug(f"Invalid income number '{income_str}': {e}")
-                    continue # Word processed, move to the next one
-
-                # Check 2: Is this word a known rarity keyword?
-                # Using .lower() for case-insensitive matching.
-                for rarity in self.ALL_RARITIES:
-                    if result_object.find_matching_words(rarity):
-                        found_rarity = rarity
-                        break
-
-            # --- Decision Logic ---
-            # Condition 1: Is the income high enough?
-            income_ok = found_income is not None and found_income >= min_income
-            # Condition 2: Is the rarity one we're looking for?
-            rarity_ok = target_rarities is not None and (found_rarity and found_rarity in target_rarities)
-
-            # false positives
-            if found_income is not None and found_income > 1000 and found_rarity in ["common", "rare", "epic"]:
-                income_ok = False 
-                rarity_ok = False 
-            if found_income is not None and found_income > 10000 and found_rarity in ["legendary"]:
-                income_ok = False 
-                rarity_ok = False  
-
-            if not found_rarity and ocr_results_raw:
-                self.debug(f"Unknown rarity found in OCR results: {ocr_results_raw}")
-
-            if income_ok or rarity_ok:
-                tooltip_text = f"FOUND!\nRarity: {found_rarity.title() if found_rarity is not None else '???'}\nIncome: ${income_str}/s"
-                self.tooltip(tooltip_text, color="green")
-                self.success(f"Match found! Rarity: {found_rarity}, Income: {found_income}.")
-                self.input_manager.key_press('e', duration=0.5)
-            else:
-                rarity_display = found_rarity.title() if found_rarity else "???"
-                income_display = f"${income_str}/s" if found_income is not None else "???"
-                tooltip_text = f"Rarity: {rarity_display}\nIncome: {income_display}"
-                self.tooltip(tooltip_text, color="red")
-                if ocr_results_raw:
-                    self.debug(f"Skipping. Rarity:'{found_rarity}' (Match:{rarity_ok}) | Income:{found_income} (Match:{income_ok})")
+            with self.stage_timings.measure("capture"):
+                # Fills the frame cache, so the OCR call below reuses this grab
+                pixels = self.window_manager.grab_frame(bounding_box)
+
+            # A partly read nameplate is OCR'd again even if it looks unchanged, until it reads in full
+            if skip_static_frames and not self.change_detector.has_changed(pixels) and not partial:
+                # Same NPC as the last OCR'd frame; nothing new to decide on, so a good time for queued actions
+                if self._should_pause_scan(idle=True):
+                    return
+                with self.stage_timings.measure("sleep"):
+                    self.safe_sleep(self._tick_interval(cadence, active=False))
+                continue
+
+            with self.stage_timings.measure("ocr"):
+                ocr_results_raw, _ = self.window_manager.get_words_in_bounding_box(bounding_box, localize_text=True)
+            if cadence is not None:
+                cadence.record_ocr(self.stage_timings.last["ocr"])
+
+            with self.stage_timings.measure("parse"):
+                detection = self.nameplate_parser.parse(ocr_results_raw)
+
+            with self.stage_timings.measure("decide"):
+                buy = self._should_buy(detection, min_income, target_rarities)
+
+            with self.stage_timings.measure("input"):
+                self._act_on_detection(detection, buy, pixels)
+
+            # Poll fast while the nameplate is changing or only partly read, back off while idle
+            nameplate = (detection.rarity, detection.income_str, detection.name)
+            partial = detection.partial
+            active = nameplate != previous_nameplate or partial
+            previous_nameplate = nameplate
+
+            if self._should_pause_scan(idle=not active):
+                return
 
-            if self.action_queue.get_queue_size() > 0:
-                raise Exception("Action queue is not empty, stopping scan.")
+            with self.stage_timings.measure("sleep"):
+                self.safe_sleep(self._tick_interval(cadence, active))
+
+    def _should_pause_scan(self, idle):
+        """
+        Asks the action queue whether the scan should stop so queued actions can run.
+
+        Args:
+            idle (bool): Whether the scan has nothing on screen worth waiting for.
+        """
+        if not self.action_queue.should_yield(idle):
+            return False
+        self.debug("Pausing scan for queued actions")
+        self._log_cache_stats()
+        self._emit_stage_stats()
+        return True
+
+    def _tick_interval(self, cadence, active):
+        """
+        Returns how long the scan loop should wait before its next tick.
+
+        Args:
+            cadence (AdaptiveCadence, optional): The scheduler, or None for the fixed 0.2 second wait.
+            active (bool): Whether this tick saw a change or a partial detection.
+        """
+        if cadence is None:
+            return 0.2
+        previous_reason = cadence.reason
+        interval = cadence.next_interval(active)
+        if cadence.reason != previous_reason:
+            self.debug(f"Scan cadence: {interval * 1000:.0f} ms ({cadence.reason})")
+        return interval
+
+    def _scan_pipelined(self, bounding_box, min_income, target_rarities, stop_time, start_time, capture_interval):
+        """
+        The scan loop of scan_npcs with capture and OCR running on ScanPipeline workers.
 
-            self.safe_sleep(0.2)
+        This thread only waits for the newest detection, decides and presses keys, so
+        the scan rate is bounded by OCR time instead of capture + OCR + sleep.
+        """
+        last_mouse_move_time = self.clock.time()
+        last_stats_time = self.clock.time()
+        pipeline = ScanPipeline(
+            self.window_manager, self.nameplate_parser, bounding_box, self.stop_event, self.stage_timings,
+            capture_interval=capture_interval, change_detector=self.change_detector,
+        )
+        with pipeline:
+            while True:
+                if self.stop_event.is_set():
+                    raise Exception("Bot stopped by user.")
+
+                # Periodically move the mouse to prevent being idle
+                if self.clock.time() - last_mouse_move_time >= 60:
+                    x_coord = random.randint(12, 13)  # Random number between 12 and 13
+                    self.input_manager.click(x_coord, 65)
+                    last_mouse_move_time = self.clock.time()
+
+                if self.clock.time() - last_stats_time >= self.STATS_INTERVAL:
+                    self._emit_stage_stats()
+                    last_stats_time = self.clock.time()
+
+                if stop_time is not None and self.clock.time() - start_time >= stop_time:
+                    self.debug(f"Scan stopped after {stop_time} seconds")
+                    self.debug(f"Pipeline: {pipeline.stats()}")
+                    self._log_cache_stats()
+                    self._emit_stage_stats()
+                    break
+
+                item = pipeline.next_detection(timeout=0.1)
+                if item is not None:
+                    detection, captured_at, pixels = item
+                    with self.stage_timings.measure("decide"):
+                        buy = self._should_buy(detection, min_income, target_rarities)
+                    if buy:
+                        # Time from the frame being captured to the buy key being pressed
+                        self.stage_timings.record("detect_to_press", time.perf_counter() - captured_at)
+                    with self.stage_timings.measure("input"):
+                        self._act_on_detection(detection, buy, pixels)
+
+                if self._should_pause_scan(idle=item is None or not item[0].lines):
+                    self.debug(f"Pipeline: {pipeline.stats()}")
+                    return
+
+    def _should_buy(self, detection, min_income, target_rarities):
+        """
+        Decides whether a scanned NPC should be bought.
+
+        Args:
+            detection (Detection): What the nameplate parser found.
+            min_income (float): The minimum income to accept.
+            target_rarities (set, optional): Accepted rarities, or None to ignore rarity.
+
+        Returns:
+            bool: True if the NPC matches the income or rarity filter.
+        """
+        found_income = detection.income
+        found_rarity = detection.rarity
+        if detection.income_error:
+            self.debug(f"Invalid income number '{detection.income_str}': {detection.income_error}")
+
+        # Condition 1: Is the income high enough?
+        income_ok = found_income is not None and found_income >= min_income
+        # Condition 2: Is the rarity one we're looking for?
+        rarity_ok = target_rarities is not None and (found_rarity and found_rarity in target_rarities)
+
+        # false positives
+        if found_income is not None and found_income > 1000 and found_rarity in ["common", "rare", "epic"]:
+            income_ok = False 
+            rarity_ok = False 
+        if found_income is not None and found_income > 10000 and found_rarity in ["legendary"]:
+            income_ok = False 
+            rarity_ok = False  
+
+        if not found_rarity and detection.lines:
+            self.debug(f"Unknown rarity found in OCR results: {detection.lines}")
+
+        if not (income_ok or rarity_ok) and detection.lines:
+            self.debug(f"Skipping. Rarity:'{found_rarity}' (Match:{rarity_ok}) | Income:{found_income} (Match:{income_ok})")
+        return bool(income_ok or rarity_ok)
+
+    def _act_on_detection(self, detection, buy, pixels=None):
+        """
+        Shows the scan result as a tooltip and presses the buy key if it's a match.
+
+        Args:
+            detection (Detection): What the nameplate parser found.
+            buy (bool): Whether to buy it.
+            pixels (numpy.ndarray, optional): The scanned frame, attached to the success message
+                                    when snapshot_settings is set.
+        """
+        found_rarity = detection.rarity
+        found_income = detection.income
+        income_str = detection.income_str if detection.income_str is not None else "N/A"
+
+        if buy:
+            tooltip_text = f"FOUND!\nRarity: {found_rarity.title() if found_rarity is not None else '???'}\nIncome: ${income_str}/s"
+            self.tooltip(tooltip_text, color="green")
+            # Only copy the frame here, before the press can reuse its buffer; cropping and encoding
+            # happen on the webhook worker
+            snapshot_pixels = pixels.copy() if self.snapshot_settings and pixels is not None else None
+            # Buy first, so nothing that goes wrong with the notification can cost the purchase
+            self.action_queue.execute(lambda: self.input_manager.key_press('e', duration=0.5), "buy")
+            if self.cash_scheduler is not None:
+                self.cash_scheduler.record_match(found_income)
+            image = Snapshot(snapshot_pixels, **self.snapshot_settings) if snapshot_pixels is not None else None
+            self.success(f"Match found! Rarity: {found_rarity}, Income: {found_income}.", image=image)
+        else:
+            rarity_display = found_rarity.title() if found_rarity else "???"
+            income_display = f"${income_str}/s" if found_income is not None else "???"
+            tooltip_text = f"Rarity: {rarity_display}\nIncome: {income_display}"
+            self.tooltip(tooltip_text, color="red")
@@ -4,25 +4,31 @@ import time
 import customtkinter
 import threading
 import keyboard
-import webbrowser
 import tkinter as tk
 import pyautogui
 import os
-import requests
+import logging
 from datetime import datetime
 
-from DonationBanner import DonationBanner
 from Events import Events
+from LogBuffer import LogBuffer, LogRecord
+from SessionLog import SessionLog
+from WebhookDispatcher import WebhookDispatcher, make_log_embed
 
 class Tooltip:
     """
     Manages a single Tkinter instance to show tooltips in a thread-safe way.
     The GUI runs in its own thread, and commands are sent to it via a queue.
+    Only the newest command matters: each tick drains the queue and applies the
+    last one, so a burst of tooltips from the scan loop never lags behind.
     """
+    TICK_MS = 50  # How often the queue is drained
+
     def __init__(self):
         self.command_queue = queue.Queue()
         self.root = None
-        self.tooltip_window = None
+        self.tooltip_window = None  # Created once, then reused and hidden with withdraw()
+        self.label = None
         self.after_id = None # To cancel scheduled hide events
 
         # The GUI will run in a separate thread
@@ -42,50 +48,59 @@ class Tooltip:
 
     def _process_queue(self):
         """
-        Check the command queue for tasks and execute them.
+        Drains the command queue and executes only the newest command.
         This is the heart of the thread-safe communication.
         """
+        latest = None
         try:
-            # Get a command from the queue without blocking
-            command, args = self.command_queue.get_nowait()
-            if command == "show":
-                self._show_tooltip(*args)
-            elif command == "hide":
-                self._hide_tooltip()
+            while True:
+                latest = self.command_queue.get_nowait()
         except queue.Empty:
-            pass # No commands? No problem.
+            pass # No more commands? No problem.
+
+        try:
+            if latest is not None:
+                command, args = latest
+                if command == "show":
+                    self._show_tooltip(*args)
+                elif command == "hide":
+                    self._hide_tooltip()
         finally:
             # Schedule the next check
             if self.root:
-                self.root.after(100, self._process_queue)
-
-    def _show_tooltip(self, text, duration_ms, x, y, fg_color, bg_color):
-        """Internal method to actually create and show the tooltip. MUST run in GUI thread."""
-        # Check if root is available
-        if not self.root:
-            return
-            
-        # If a tooltip is already visible, hide it first
-        if self.tooltip_window:
-            self._hide_tooltip()
+                self.root.after(self.TICK_MS, self._process_queue)
 
-        # Create the new tooltip window
+    def _create_window(self):
+        """Builds the tooltip window once. MUST run in GUI thread."""
         self.tooltip_window = tk.Toplevel(self.root)
         self.tooltip_window.overrideredirect(True)
-        self.tooltip_window.wm_geometry(f"+{x}+{y}")
+        self.tooltip_window.withdraw()
 
         # Enhanced tooltip with rounded corners and better styling
-        frame = tk.Frame(self.tooltip_window, background=bg_color, bd=0)
-        frame.pack(fill="both", expand=True)
-        
-        label = tk.Label(frame, text=text,
-                        background=bg_color,
-                        foreground=fg_color,
-                        relief="flat", borderwidth=0,
-                        font=("Segoe UI", 10), padx=8, pady=5)
-        label.pack()
+        self.label = tk.Label(self.tooltip_window,
+                              relief="flat", borderwidth=0,
+                              font=("Segoe UI", 10), padx=8, pady=5)
+        self.label.pack(fill="both", expand=True)
+
+    def _show_tooltip(self, text, duration_ms, offset_x, offset_y, fg_color, bg_color):
+        """Internal method to update and show the tooltip at the mouse. MUST run in GUI thread."""
+        # Check if root is available
+        if not self.root:
+            return
+        if self.tooltip_window is None:
+            self._create_window()
 
-        # Schedule the tooltip to be hidden
+        # Read the mouse position here rather than on the thread that asked for the tooltip
+        mouse_x, mouse_y = pyautogui.position()
+        self.label.configure(text=text, background=bg_color, foreground=fg_color)
+        self.tooltip_window.configure(background=bg_color)
+        self.tooltip_window.wm_geometry(f"+{mouse_x + offset_x}+{mouse_y + offset_y}")
+        self.tooltip_window.deiconify()
+        self.tooltip_window.lift()
+
+        # Schedule the tooltip to be hidden, replacing the previous tooltip's timer
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
         self.after_id = self.root.after(duration_ms, self._hide_tooltip)
 
     def _hide_tooltip(self):
@@ -95,27 +110,20 @@ class Tooltip:
             self.root.after_cancel(self.after_id)
             self.after_id = None
 
-        # Destroy the window if it exists
+        # Keep the window for the next tooltip
         if self.tooltip_window:
-            self.tooltip_window.destroy()
-            self.tooltip_window = None
+            self.tooltip_window.withdraw()
 
     # --- Public Methods (Can be called from ANY thread) ---
 
     def show(self, text, duration_ms=2000, offset_x=20, offset_y=10, fg_color="white", color="#2D2D2D"):
         """
         Public method to request a tooltip to be shown.
-        This is thread-safe.
+        This is thread-safe and only enqueues; the GUI thread positions it at the mouse.
         """
-        # Get mouse position at the time of the call
-        mouse_x, mouse_y = pyautogui.position()
-        x_pos = mouse_x + offset_x
-        y_pos = mouse_y + offset_y
-
-        # Put the command and its arguments onto the queue for the GUI thread to process
-        args = (text, duration_ms, x_pos, y_pos, fg_color, color)
+        args = (text, duration_ms, offset_x, offset_y, fg_color, color)
         self.command_queue.put(("show", args))
-        
+
     def stop(self):
         """Stops the GUI thread gracefully."""
         if self.root:
@@ -142,7 +150,16 @@ class GuiManager:
         self.macro_thread = None
         self.stop_event = threading.Event()
         self.running = False
-        self.log_count = 0
+        self.log_buffer = LogBuffer(capacity=5000)
+        self.log_flushed = 0  # log_buffer.total at the last flush
+        self.log_render_after = None
+        self.webhook_dispatcher = WebhookDispatcher()  # One background sender for every Discord message
+        # Full history of every event on disk, since the Activity Log only keeps the latest lines
+        self.session_log = SessionLog.from_settings(self.initial_settings)
+        if self.session_log:
+            self.session_log.start()
+            self.session_log_handler = self.session_log.logging_handler()
+            logging.getLogger().addHandler(self.session_log_handler)
         self.version = self._get_version()
         self.startup_time = time.time()
 
@@ -169,12 +186,17 @@ class GuiManager:
         self.app.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.tooltips = Tooltip()
         self.event_manager = Events()
-        self.event_manager.subscribe("status_change", self.change_status)
-        self.event_manager.subscribe("status_change", self.add_log)
-        self.event_manager.subscribe("tooltip", self.tooltips.show)
-        self.event_manager.subscribe("log", self.add_log)
-        self.event_manager.subscribe("success", lambda msg: self.add_log(msg, level="success"))
-        self.event_manager.subscribe("debug", lambda msg: self.add_log(msg, level="debug"))
+        # Widgets are only touched on the Tk thread; the bot thread just enqueues
+        self.event_manager.subscribe("status_change", self.change_status, mode="tk")
+        self.event_manager.subscribe("status_change", self.add_log, mode="tk", with_time=True)
+        # show() only enqueues, so it can run on the emitting thread
+        self.event_manager.subscribe("tooltip", self.tooltips.show, mode="sync")
+        self.event_manager.subscribe("log", self.add_log, mode="tk", with_time=True)
+        self.event_manager.subscribe("success", lambda msg, image=None, emitted_at=None: self.add_log(msg, level="success", attachment=image, emitted_at=emitted_at), mode="tk", with_time=True)
+        self.event_manager.subscribe("debug", lambda msg, emitted_at=None: self.add_log(msg, level="debug", emitted_at=emitted_at), mode="tk", with_time=True)
+        self.event_manager.subscribe("stats", lambda msg, summary, emitted_at=None: self.add_log(msg, level="info", emitted_at=emitted_at), mode="tk", with_time=True)
+        self.event_manager.bind_tk(self.app)
+        self.app.after(self.LOG_FLUSH_MS, self._flush_log)
 
     def run(self):
         """Starts the customtkinter main loop."""
@@ -182,6 +204,7 @@ class GuiManager:
 
     def open_link(self, url):
         """Opens a URL in the default web browser."""
+        import webbrowser  # Only needed when a link is clicked
         webbrowser.open_new(url)
 
     def _create_widgets(self):
@@ -493,6 +516,9 @@ class GuiManager:
         )
         self.scan_log_text.grid(row=0, column=0, padx=0, pady=0, sticky="nsew")
         self.scan_log_text.configure(state="disabled")
+        # One tag per level, configured once
+        for level, (_, color) in self.LOG_LEVELS.items():
+            self.scan_log_text.tag_config(f"level_{level}", foreground=color)
         
         # Log controls frame - now with two columns
         log_controls = customtkinter.CTkFrame(log_tab, fg_color="transparent")
@@ -526,7 +552,8 @@ class GuiManager:
             switch_width=40,
             switch_height=20,
             onvalue=True,
-            offvalue=False
+            offvalue=False,
+            command=self._render_log
         )
         self.debug_mode_switch.pack(side="left")
         
@@ -564,6 +591,15 @@ class GuiManager:
             corner_radius=8
         )
         clear_log_button.grid(row=0, column=1, padx=10, pady=0, sticky="e")
+
+        # Search box; filters the log buffer, not the textbox
+        self.log_search = customtkinter.CTkEntry(
+            log_controls,
+            placeholder_text="Search log...",
+            height=30
+        )
+        self.log_search.grid(row=1, column=0, columnspan=2, padx=(0, 10), pady=(5, 0), sticky="ew")
+        self.log_search.bind("<KeyRelease>", self._schedule_render_log)
         
         # Webhook URL entry in a separate row
         webhook_url_frame = customtkinter.CTkFrame(log_tab, fg_color="transparent")
@@ -722,143 +758,101 @@ class GuiManager:
         self.filter_summary.insert("1.0", summary_text)
         self.filter_summary.configure(state="disabled")
 
-    def add_log(self, message, level="default"):
+    LOG_LEVELS = {  # level: (prefix, color)
+        "info": ("INFO", "#3b82f6"),  # Blue
+        "warning": ("WARN", "#f59e0b"),  # Yellow/Orange
+        "error": ("ERROR", "#dc2626"),  # Red
+        "success": ("SUCCESS", "#16a34a"),  # Green
+        "debug": ("DEBUG", "#9333ea"),  # Purple
+        "default": ("LOG", "#9a9da0"),  # Light gray
+    }
+    LOG_FLUSH_MS = 100  # How often new log lines are written to the textbox
+    LOG_VIEW_LINES = 1000  # Lines kept in the textbox; the full history is in self.log_buffer
+
+    def add_log(self, message, level="default", attachment=None, emitted_at=None):
         """
         Adds a message to the log with timestamp and color-coding based on level.
+        The line is stored in the log buffer and shown on the next flush.
         :param message: The log message to add
         :param level: The log level (default, info, warning, error, success)
+        :param attachment: Optional Snapshot sent along with the message to Discord
+        :param emitted_at: time.time() when the message was emitted; defaults to now
         """
+        if level not in self.LOG_LEVELS:
+            level = "default"
+        prefix = self.LOG_LEVELS[level][0]
+        timestamp = (datetime.fromtimestamp(emitted_at) if emitted_at is not None else datetime.now()).strftime("%H:%M:%S")
+        self.log_buffer.append(LogRecord(timestamp, level, prefix, message))
+
+        # Send to Discord if enabled and it's not a debug message or debug mode is on
+        if self.discord_webhook_switch.get() and self.discord_webhook_url.get().strip() and (level != "debug" or self.debug_mode_switch.get()):
+            # Queued for the dispatcher's worker, which batches lines and handles rate limits
+            self.webhook_dispatcher.send(
+                self.discord_webhook_url.get().strip(),
+                make_log_embed(message, level, prefix, timestamp),
+                attachment
+            )
+
+    def _log_filter(self, records=None):
+        """Applies the debug switch and the search box to records (default: the whole buffer)."""
+        hidden_levels = () if self.debug_mode_switch.get() else ("debug",)
+        return self.log_buffer.filter(records, hidden_levels, self.log_search.get().strip())
+
+    def _write_log_records(self, records):
+        """Appends records to the textbox, one insert per run of same-level lines, then trims and scrolls."""
         self.scan_log_text.configure(state="normal")
-        
-        # Add timestamp
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        # Determine log color based on level
-        if level == "info":
-            color = "#3b82f6"  # Blue
-            prefix = "INFO"
-        elif level == "warning":
-            color = "#f59e0b"  # Yellow/Orange
-            prefix = "WARN"
-        elif level == "error":
-            color = "#dc2626"  # Red
-            prefix = "ERROR"
-        elif level == "success":
-            color = "#16a34a"  # Green
-            prefix = "SUCCESS"
-        elif level == "debug" and self.debug_mode_switch.get():  # Only show debug messages if debug mode is on
-            color = "#9333ea"  # Purple
-            prefix = "DEBUG"
-        elif level == "debug":
-            # Skip debug messages when debug mode is off
-            self.scan_log_text.configure(state="disabled")
-            return
-        else:
-            color = "#9a9da0"  # Light gray (default)
-            prefix = "LOG"
-            
-        # Format the log entry
-        log_entry = f"[{timestamp}] [{prefix}] {message}\n"
-        
-        # Get the current end position before inserting
-        end_position = self.scan_log_text.index("end-1c")
-        
-        # Insert at the end (append) instead of the beginning
-        self.scan_log_text.insert("end", log_entry)
-        
-        # Apply color tag
-        tag_name = f"tag_{self.log_count}"
-        self.scan_log_text.tag_add(tag_name, end_position, "end-1c")
-        self.scan_log_text.tag_config(tag_name, foreground=color)
-        
-        self.log_count += 1
-        
+        start = 0
+        while start < len(records):
+            end = start
+            while end < len(records) and records[end].level == records[start].level:
+                end += 1
+            text = "".join(record.format() for record in records[start:end])
+            self.scan_log_text.insert("end", text, f"level_{records[start].level}")
+            start = end
+
         # Limit log size to prevent performance issues
-        if self.log_count > 1000:
-            # Delete the oldest entries (from the beginning now)
-            self.scan_log_text.delete("1.0", "500.0")
-            self.log_count = 500
-            
+        line_count = int(self.scan_log_text.index("end-1c").split(".")[0]) - 1
+        if line_count > self.LOG_VIEW_LINES:
+            self.scan_log_text.delete("1.0", f"{line_count - self.LOG_VIEW_LINES + 1}.0")
+
         # Auto-scroll to the bottom to show the newest entry
         self.scan_log_text.see("end")
-        
         self.scan_log_text.configure(state="disabled")
-        
-        # Send to Discord if enabled and it's not a debug message or debug mode is on
-        if self.discord_webhook_switch.get() and self.discord_webhook_url.get().strip() and (level != "debug" or self.debug_mode_switch.get()):
-            # Start a new thread to send the webhook without blocking the UI
-            threading.Thread(
-                target=self._send_to_discord,
-                args=(message, level, prefix, timestamp),
-                daemon=True
-            ).start()
-            
-        # If on another tab, show a notification dot
-        if self.tab_view.get() != "Activity Log":
-            pass  # Could implement a notification indicator here
-
-    def _send_to_discord(self, message, level, prefix, timestamp):
-        """
-        Sends a log message to Discord via webhook.
-        
-        Args:
-            message: The log message content
-            level: The log level (info, warning, error, success, debug)
-            prefix: The log prefix (INFO, WARN, etc.)
-            timestamp: The timestamp string
-        """
-        try:
-            webhook_url = self.discord_webhook_url.get().strip()
-            
-            # Select color based on log level (using Discord's color format - decimal color code)
-            if level == "info":
-                color = 3447003  # Blue
-            elif level == "warning":
-                color = 16761095  # Orange
-            elif level == "error":
-                color = 15158332  # Red
-            elif level == "success":
-                color = 3066993  # Green
-            elif level == "debug":
-                color = 10181046  # Purple
-            else:
-                color = 9807270  # Gray
-                
-            # Create the webhook payload
-            payload = {
-                "username": "Brainrot Macro Logger",
-                "embeds": [{
-                    "title": f"[{prefix}] Log Entry",
-                    "description": message,
-                    "color": color,
-                    "footer": {
-                        "text": f"Time: {timestamp}"
-                    }
-                }]
-            }
-            
-            # Send the webhook request
-            response = requests.post(
-                webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=5
-            )
-            
-            # Check if the request was successful
-            if response.status_code >= 400:
-                print(f"Discord webhook error: HTTP {response.status_code}, {response.text}")
-                
-        except Exception as e:
-            # Print error to console but don't disrupt the UI
-            print(f"Error sending Discord webhook: {e}")
 
-    def clear_log(self):
-        """Clears the scan log text area."""
+    def _flush_log(self):
+        """Writes the lines added since the last flush. Runs every LOG_FLUSH_MS on the Tk thread."""
+        records = self.log_buffer.since(self.log_flushed)
+        self.log_flushed = self.log_buffer.total
+        if records:
+            records = self._log_filter(records)
+            if records:
+                self._write_log_records(records)
+        self.app.after(self.LOG_FLUSH_MS, self._flush_log)
+
+    def _render_log(self, *_):
+        """Redraws the textbox from the log buffer, e.g. after the filter changed."""
         self.scan_log_text.configure(state="normal")
         self.scan_log_text.delete("1.0", "end")
         self.scan_log_text.configure(state="disabled")
-        self.log_count = 0
+        self.log_flushed = self.log_buffer.total
+        records = self._log_filter()[-self.LOG_VIEW_LINES:]
+        if records:
+            self._write_log_records(records)
+
+    def _schedule_render_log(self, *_):
+        """Redraws the log shortly after the last keystroke in the search box."""
+        if self.log_render_after is not None:
+            self.app.after_cancel(self.log_render_after)
+        self.log_render_after = self.app.after(150, self._finish_render_log)
+
+    def _finish_render_log(self):
+        self.log_render_after = None
+        self._render_log()
+
+    def clear_log(self):
+        """Clears the scan log text area."""
+        self.log_buffer.clear()
+        self._render_log()
         self.add_log("Log cleared", level="info")
 
     def on_closing(self):
@@ -870,6 +864,10 @@ class GuiManager:
         self.stop_macro()
         keyboard.unhook_all_hotkeys()
         self.tooltips.stop()
+        self.webhook_dispatcher.close()
+        if self.session_log:
+            logging.getLogger().removeHandler(self.session_log_handler)
+            self.session_log.close()
         self.app.destroy()
 
     def _toggle_webhook_visibility(self):
@@ -882,7 +880,9 @@ class GuiManager:
     def get_settings(self):
         """Gathers all settings from the GUI widgets and returns them as a dictionary."""
         try:
-            settings = {
+            # Start from the stored settings so options without a widget survive a save
+            settings = dict(self.settings_manager.get_settings()) if self.settings_manager else {}
+            settings.update({
                 "auto_collect_money": bool(self.auto_collect_check.get()),
                 "collect_money_interval": int(self.collect_money_interval_entry.get() or 60),
                 "auto_scan_npcs": bool(self.auto_scan_check.get()),
@@ -893,7 +893,7 @@ class GuiManager:
                 "debug_mode": bool(self.debug_mode_switch.get()),
                 "send_to_discord": bool(self.discord_webhook_switch.get()),
                 "discord_webhook_url": self.discord_webhook_url.get().strip() if self.discord_webhook_switch.get() else ""
-            }
+            })
             return settings
         except ValueError as e:
             self.change_status(f"Error: Invalid input. {e}", "red")
@@ -934,10 +934,17 @@ class GuiManager:
         self.start_button.configure(state="normal")
         self.stop_button.configure(state="disabled")
         if (time.time() - self.startup_time) > (60 * 10) and random() < 0.2:
+            from DonationBanner import DonationBanner  # Only shown now and then
             DonationBanner.show_banner(self.app,self.settings_manager)
 
         # Add to log
         self.add_log("Macro stopped by user", level="warning")
+        webhook_stats = self.webhook_dispatcher.stats()
+        if webhook_stats["dropped_full"] or webhook_stats["dropped_failed"]:
+            self.add_log(f"Discord webhook: {webhook_stats['sent_embeds']} lines sent, "
+                         f"{webhook_stats['dropped_full']} dropped (queue full), "
+                         f"{webhook_stats['dropped_failed']} dropped (failed), "
+                         f"{webhook_stats['rate_limited']} rate limits hit", level="debug")
 
     def change_status(self, message, color="gray"):
         """
@@ -0,0 +1,82 @@
+import re
+from functools import lru_cache
+
+# Multiplier for each suffix shown in game, lowercase
+SUFFIXES = {
+    "k": 1_000,
+    "m": 1_000_000,
+    "b": 1_000_000_000,
+    "t": 1_000_000_000_000,
+    "qd": 1_000_000_000_000_000,
+}
+
+# Characters OCR commonly reads in place of digits
+_DIGIT_CONFUSIONS = str.maketrans({"o": "0", "l": "1", "i": "1", "|": "1"})
+
+_NUMBER_PATTERN = re.compile(r"(?P<number>[0-9oli|][0-9oli|.,]*)(?P<suffix>qd|[kmbt])?")
+_THOUSANDS_SEPARATOR = re.compile(r",(?=\d{3}(?!\d))")
+# "$1.5k/s" inside a longer OCR line; OCR sometimes reads the "s" as a "5"
+INCOME_PATTERN = re.compile(r"\$\s*(?P<income>[^$/]+?)\s*/\s*[s5]\b")
+
+
+@lru_cache(maxsize=1024)
+def parse_income(text):
+    """
+    Converts an income string (e.g., "1.5k", "$2.3B/s", "1,250") into its numerical value.
+
+    Tolerates the usual OCR confusions in the numeric part ("O" for 0, "l"/"I" for 1),
+    thousands separators, surrounding "$" and "/s", whitespace and case.
+    Results are memoized, since the same few strings show up tick after tick.
+
+    :param text: The income string.
+    :return: The value as a float.
+    :raises TypeError: If text is not a string.
+    :raises ValueError: If the string is not a recognizable number.
+    """
+    if not isinstance(text, str):
+        raise TypeError("Input must be a string.")
+
+    s = text.strip().lower().replace(" ", "")
+    if s.startswith("$"):
+        s = s[1:]
+    if s.endswith("/s"):
+        s = s[:-2]
+
+    match = _NUMBER_PATTERN.fullmatch(s)
+    if not match:
+        raise ValueError(f"Invalid income format: '{text}'")
+
+    number = match.group("number").translate(_DIGIT_CONFUSIONS)
+    # A comma before exactly three digits separates thousands; any other comma is a misread decimal point
+    number = _THOUSANDS_SEPARATOR.sub("", number).replace(",", ".")
+    try:
+        value = float(number)
+    except ValueError:
+        raise ValueError(f"Could not parse numeric part '{match.group('number')}' from '{text}'")
+
+    suffix = match.group("suffix")
+    if suffix:
+        value *= SUFFIXES[suffix]
+    return value
+
+
+def parse_incomes(lines):
+    """
+    Finds and parses the income in every OCR line of a frame at once.
+
+    :param lines: A list of text lines, or of (text, coords) tuples as returned by
+                  WindowManager.get_words_in_bounding_box.
+    :return: A list with, for each line, the parsed income of its last "$.../s" token,
+             or None if the line has no parsable income.
+    """
+    incomes = []
+    for line in lines:
+        text = line[0] if isinstance(line, tuple) else line
+        value = None
+        for match in INCOME_PATTERN.finditer(text):
+            try:
+                value = parse_income(match.group("income"))
+            except ValueError:
+                pass
+        incomes.append(value)
+    return incomes
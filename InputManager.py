@@ -1,18 +1,27 @@
 import pydirectinput as pdi
-from time import sleep
+from time import monotonic, sleep
 import win32gui
+from InputScript import InputScript, ScriptRunner
 
 class InputManager:
+    FOREGROUND_CACHE_SECONDS = 0.25  # How long a foreground check is trusted before asking Windows again
+
     def __init__(self, hwnd):
         """
         Initializes the InputManager.
         :param hwnd: The handle to the target window.
         """
         self.hwnd = hwnd
+        self._foreground_active = False
+        self._foreground_checked_at = None
 
     def _is_window_active(self):
         """Checks if the target window is the current foreground window."""
-        return win32gui.GetForegroundWindow() == self.hwnd
+        now = monotonic()
+        if self._foreground_checked_at is None or now - self._foreground_checked_at >= self.FOREGROUND_CACHE_SECONDS:
+            self._foreground_active = win32gui.GetForegroundWindow() == self.hwnd
+            self._foreground_checked_at = now
+        return self._foreground_active
 
     def _client_to_screen(self, x, y):
         """Converts client coordinates to screen coordinates."""
@@ -67,10 +76,35 @@ class InputManager:
         if not self._is_window_active(): return
         pdi.scroll(*args, **kwargs)
 
-    def key_press(self, *args, **kwargs):
+    def key_press(self, key, duration=None, **kwargs):
         """
         Sends a key press. This is not coordinate-dependent.
         :param key: The key to press (e.g., 'w').
+        :param duration: Optional seconds to hold the key, timed by the script runner.
+        :param kwargs: Keyword arguments for pydirectinput.press.
         """
         if not self._is_window_active(): return
-        pdi.press(*args, **kwargs)
\ No newline at end of file
+        if duration:
+            self.run_script(InputScript(f"hold {key}").hold(key, duration))
+        else:
+            pdi.press(key, **kwargs)
+
+    def key_down(self, key):
+        """Presses a key without releasing it or pausing afterwards."""
+        pdi.keyDown(key, _pause=False)
+
+    def key_up(self, key):
+        """Releases a key without pausing afterwards."""
+        pdi.keyUp(key, _pause=False)
+
+    def run_script(self, script, stop_event=None, settle=None):
+        """
+        Sends a whole InputScript as one timed batch.
+        The script is aborted, with every held key released, if the window loses focus.
+        :param script: The InputScript to send.
+        :param stop_event: Optional event that aborts the script.
+        :param settle: Optional callable(timeout) used for the script's settle steps.
+        :return: The ScriptRunner timing report, or None if the window is not active.
+        """
+        if not self._is_window_active(): return None
+        return ScriptRunner(self, is_active=self._is_window_active, settle=settle).run(script, stop_event)
\ No newline at end of file
@@ -0,0 +1,220 @@
+import time
+
+
+class InputScript:
+    """
+    A timed sequence of key holds, built up front and sent in one go by ScriptRunner.
+
+    Holds are laid out on a timeline: hold() and wait() move the cursor forward,
+    and hold(..., at=...) places a hold at an explicit offset so keys can overlap.
+    settle() ends the current timed segment; the runner then waits for the screen
+    to settle (or the timeout) before timing the next segment.
+
+        script = InputScript("collect").hold('a', 0.55).settle(0.5).hold('w', 0.4)
+    """
+
+    def __init__(self, name="script"):
+        """
+        :param name: Shown in logs and timing reports.
+        """
+        self.name = name
+        self.steps = []  # ("keys", [(offset, "down"/"up", key), ...], length) or ("settle", timeout)
+        self._events = []
+        self._cursor = 0.0
+        self._length = 0.0
+
+    def hold(self, key, duration, at=None):
+        """
+        Holds a key down for the given number of seconds.
+
+        :param key: The key name, as understood by the input backend.
+        :param duration: Seconds to hold it; 0 is a tap.
+        :param at: Offset in seconds from the start of the current segment. Defaults to the
+                   cursor, which then moves past the hold; an explicit offset leaves it alone.
+        """
+        start = self._cursor if at is None else at
+        self._events.append((start, "down", key))
+        self._events.append((start + duration, "up", key))
+        self._length = max(self._length, start + duration)
+        if at is None:
+            self._cursor = start + duration
+        return self
+
+    def press(self, key):
+        """Taps a key."""
+        return self.hold(key, 0)
+
+    def wait(self, seconds):
+        """Moves the cursor forward without pressing anything."""
+        self._cursor += seconds
+        self._length = max(self._length, self._cursor)
+        return self
+
+    def settle(self, timeout):
+        """Waits until the screen stops moving, for at most timeout seconds."""
+        self._close_segment()
+        self.steps.append(("settle", timeout))
+        return self
+
+    def _close_segment(self):
+        if self._events or self._length:
+            # Stable sort keeps a tap's down before its up when both land on the same offset
+            self.steps.append(("keys", sorted(self._events, key=lambda event: event[0]), self._length))
+        self._events = []
+        self._cursor = 0.0
+        self._length = 0.0
+
+    def finish(self):
+        """Closes the last segment. Called by ScriptRunner; further holds start a new segment."""
+        self._close_segment()
+        return self
+
+    def duration(self):
+        """Longest time the script can take, counting every settle at its full timeout."""
+        self.finish()
+        return sum(step[2] if step[0] == "keys" else step[1] for step in self.steps)
+
+    def keys(self):
+        """Every key the script presses."""
+        self.finish()
+        return {event[2] for step in self.steps if step[0] == "keys" for event in step[1]}
+
+
+class ScriptRunner:
+    """
+    Sends an InputScript through a backend with key_down(key) / key_up(key).
+
+    Each segment is scheduled against one start time, so late events do not push
+    back later ones the way chained sleeps do. Sleeps stop `spin` seconds short
+    of each event and the rest is spun, which keeps holds accurate to a
+    millisecond or so on Windows, where sleep granularity is much coarser.
+    """
+
+    SPIN_SECONDS = 0.002
+
+    def __init__(self, backend, is_active=None, settle=None, timer=time.perf_counter, sleep=time.sleep,
+                 spin=SPIN_SECONDS):
+        """
+        :param backend: Object with key_down(key) and key_up(key).
+        :param is_active: Optional callable; the script is aborted when it returns False.
+        :param settle: Optional callable(timeout) used for settle steps. Defaults to sleeping the timeout.
+        :param timer: Monotonic clock in seconds.
+        :param sleep: Sleep function matching timer.
+        :param spin: Seconds spun instead of slept before each event; 0 for clocks that only
+                     move when slept, such as FakeClock.
+        """
+        self.backend = backend
+        self.is_active = is_active
+        self.settle = settle
+        self.timer = timer
+        self.sleep = sleep
+        self.spin = spin
+
+    def _sleep_until(self, target):
+        remaining = target - self.timer()
+        if remaining > self.spin:
+            self.sleep(remaining - self.spin)
+        if self.spin:
+            while self.timer() < target:
+                pass
+
+    def _aborted(self, stop_event):
+        return (stop_event is not None and stop_event.is_set()) or (self.is_active is not None and not self.is_active())
+
+    def run(self, script, stop_event=None):
+        """
+        Runs a script. Keys still held when it is aborted or fails are always released.
+
+        :param script: The InputScript.
+        :param stop_event: Optional event that aborts the script between two events.
+        :return: A dict with 'events' sent, 'aborted', and 'max_lateness' / 'mean_lateness' in seconds.
+        """
+        script.finish()
+        held = set()
+        lateness = []
+        aborted = False
+        try:
+            for step in script.steps:
+                if step[0] == "settle":
+                    if self.settle is not None:
+                        self.settle(step[1])
+                    else:
+                        self.sleep(step[1])
+                    continue
+
+                _, events, length = step
+                start = self.timer()
+                for offset, action, key in events:
+                    self._sleep_until(start + offset)
+                    if self._aborted(stop_event):
+                        aborted = True
+                        return self._report(lateness, aborted)
+                    lateness.append(self.timer() - (start + offset))
+                    if action == "down":
+                        self.backend.key_down(key)
+                        held.add(key)
+                    else:
+                        self.backend.key_up(key)
+                        held.discard(key)
+                self._sleep_until(start + length)
+            return self._report(lateness, aborted)
+        finally:
+            for key in held:
+                self.backend.key_up(key)
+
+    @staticmethod
+    def _report(lateness, aborted):
+        return {
+            "events": len(lateness),
+            "aborted": aborted,
+            "max_lateness": max(lateness) if lateness else 0.0,
+            "mean_lateness": sum(lateness) / len(lateness) if lateness else 0.0,
+        }
+
+
+class RecordingBackend:
+    """Input backend that records key events with timestamps instead of sending them."""
+
+    def __init__(self, timer=time.perf_counter):
+        """
+        :param timer: Clock used for the timestamps.
+        """
+        self.timer = timer
+        self.events = []  # (time, "down"/"up", key)
+
+    def key_down(self, key):
+        self.events.append((self.timer(), "down", key))
+
+    def key_up(self, key):
+        self.events.append((self.timer(), "up", key))
+
+    def hold_times(self):
+        """Returns [(key, seconds held)] for every completed hold, in release order."""
+        pressed = {}
+        holds = []
+        for timestamp, action, key in self.events:
+            if action == "down":
+                pressed[key] = timestamp
+            elif key in pressed:
+                holds.append((key, timestamp - pressed.pop(key)))
+        return holds
+
+
+if __name__ == "__main__":
+    # Times the collect_money walk through the runner against the recording backend
+    script = (InputScript("collect money")
+              .hold('a', 0.55).wait(0.1)
+              .hold('w', 0.4).wait(0.1)
+              .hold('a', 1.0).wait(0.1)
+              .hold('s', 0.7).wait(0.1)
+              .hold('d', 1.0))
+    planned = [0.55, 0.4, 1.0, 0.7, 1.0]
+    backend = RecordingBackend()
+    started = time.perf_counter()
+    report = ScriptRunner(backend).run(script)
+    elapsed = time.perf_counter() - started
+
+    print(f"Planned {script.duration():.3f}s, took {elapsed:.3f}s")
+    print(f"Event lateness: max {report['max_lateness'] * 1000:.2f} ms, mean {report['mean_lateness'] * 1000:.2f} ms")
+    for (key, held), wanted in zip(backend.hold_times(), planned):
+        print(f"  {key}: held {held * 1000:7.2f} ms (wanted {wanted * 1000:.0f} ms)")
@@ -0,0 +1,62 @@
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass
+class LogRecord:
+    timestamp: str
+    level: str
+    prefix: str
+    message: str
+
+    def format(self):
+        return f"[{self.timestamp}] [{self.prefix}] {self.message}\n"
+
+
+class LogBuffer:
+    """
+    Fixed-size ring buffer of Activity Log records.
+
+    The log view renders from here instead of keeping its own history, so
+    filtering and searching never have to read the text widget, and the oldest
+    records simply fall off once capacity is reached.
+    """
+
+    def __init__(self, capacity=5000):
+        """
+        :param capacity: Records kept; older ones are discarded.
+        """
+        self.records = deque(maxlen=capacity)
+        self.total = 0  # Records ever appended, used as a sequence number
+
+    def append(self, record):
+        self.records.append(record)
+        self.total += 1
+
+    def since(self, sequence):
+        """
+        Returns the records appended after the given sequence number that are still buffered.
+
+        :param sequence: A previous value of self.total.
+        """
+        count = min(self.total - sequence, len(self.records))
+        if count <= 0:
+            return []
+        return list(self.records)[-count:]
+
+    def filter(self, records=None, hidden_levels=(), text=""):
+        """
+        Returns the records that should be shown.
+
+        :param records: Records to filter. Defaults to the whole buffer.
+        :param hidden_levels: Levels to leave out, e.g. {"debug"}.
+        :param text: Case-insensitive text every shown record must contain.
+        """
+        text = text.lower()
+        return [
+            record for record in (self.records if records is None else records)
+            if record.level not in hidden_levels and (not text or text in record.message.lower())
+        ]
+
+    def clear(self):
+        self.records.clear()
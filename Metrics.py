@@ -0,0 +1,150 @@
+import time
+from contextlib import contextmanager
+
+
+class LatencyHistogram:
+    """
+    Fixed-size, HDR-style latency histogram.
+
+    Values are recorded in whole microseconds into log-linear buckets: exact
+    below sub_buckets, then sub_buckets / 2 linear buckets per power of two.
+    With the default 32 sub-buckets every percentile is within ~6% of the true
+    value, and the bucket array never grows no matter how much is recorded.
+    """
+
+    def __init__(self, max_seconds=60.0, sub_buckets=32):
+        """
+        :param max_seconds: Largest value tracked; anything slower is recorded as this.
+        :param sub_buckets: Linear resolution, must be a power of two.
+        """
+        if sub_buckets < 2 or sub_buckets & (sub_buckets - 1):
+            raise ValueError("sub_buckets must be a power of two.")
+        self.sub_buckets = sub_buckets
+        self._sub_bits = sub_buckets.bit_length() - 1
+        self.max_micros = int(max_seconds * 1_000_000)
+        self.counts = [0] * (self._index(self.max_micros) + 1)
+        self.count = 0
+        self.total_micros = 0
+        self.max_recorded = 0
+
+    def _index(self, micros):
+        if micros < self.sub_buckets:
+            return micros
+        shift = micros.bit_length() - self._sub_bits
+        mantissa = micros >> shift
+        half = self.sub_buckets // 2
+        return self.sub_buckets + (shift - 1) * half + (mantissa - half)
+
+    def _bucket_bounds(self, index):
+        """Returns the (lowest, highest) microsecond value that falls into a bucket."""
+        if index < self.sub_buckets:
+            return index, index
+        half = self.sub_buckets // 2
+        shift = (index - self.sub_buckets) // half + 1
+        mantissa = (index - self.sub_buckets) % half + half
+        low = mantissa << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, seconds):
+        """Adds one latency sample, in seconds."""
+        micros = min(max(int(seconds * 1_000_000), 0), self.max_micros)
+        self.counts[self._index(micros)] += 1
+        self.count += 1
+        self.total_micros += micros
+        self.max_recorded = max(self.max_recorded, micros)
+
+    def percentile(self, percent):
+        """
+        Returns the latency (in seconds) below which the given percentage of samples fall.
+
+        :param percent: 0-100.
+        :return: The bucket's midpoint in seconds, or None if nothing was recorded.
+        """
+        if not self.count:
+            return None
+        target = max(1, -(-self.count * percent // 100))  # ceil without floats
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                low, high = self._bucket_bounds(index)
+                return min((low + high) / 2, self.max_recorded) / 1_000_000
+        return self.max_recorded / 1_000_000
+
+    def reset(self):
+        """Drops every recorded sample."""
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total_micros = 0
+        self.max_recorded = 0
+
+    def summary(self):
+        """
+        Returns the usual latency statistics.
+
+        :return: A dict with 'count', and 'mean', 'p50', 'p95', 'p99', 'max' in seconds
+                 (None when nothing was recorded).
+        """
+        return {
+            "count": self.count,
+            "mean": self.total_micros / self.count / 1_000_000 if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max_recorded / 1_000_000 if self.count else None,
+        }
+
+
+class StageTimings:
+    """One LatencyHistogram per named pipeline stage."""
+
+    def __init__(self, stages=(), **histogram_kwargs):
+        """
+        :param stages: Stage names to report in this order, even before anything is recorded.
+        :param histogram_kwargs: Passed to every LatencyHistogram.
+        """
+        self._histogram_kwargs = histogram_kwargs
+        self.histograms = {stage: LatencyHistogram(**histogram_kwargs) for stage in stages}
+        self.last = {}  # Most recent sample of each stage, in seconds
+
+    def record(self, stage, seconds):
+        """Adds one sample to a stage, creating the stage on first use."""
+        if stage not in self.histograms:
+            self.histograms[stage] = LatencyHistogram(**self._histogram_kwargs)
+        self.histograms[stage].record(seconds)
+        self.last[stage] = seconds
+
+    @contextmanager
+    def measure(self, stage):
+        """Context manager that records how long its body took under the given stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def summary(self):
+        """Returns {stage: LatencyHistogram.summary()} for every stage."""
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+
+def format_summary(summary):
+    """
+    Formats a StageTimings summary as a single log line.
+
+    :param summary: The dict returned by StageTimings.summary().
+    :return: e.g. "capture p50 1.2ms p95 3.1ms p99 4.0ms | ocr p50 85ms ..."
+    """
+    def ms(seconds):
+        milliseconds = seconds * 1000
+        return f"{milliseconds:.0f}ms" if milliseconds >= 10 else f"{milliseconds:.1f}ms"
+
+    parts = []
+    for stage, stats in summary.items():
+        if stats["count"]:
+            parts.append(f"{stage} p50 {ms(stats['p50'])} p95 {ms(stats['p95'])} p99 {ms(stats['p99'])}")
+    return " | ".join(parts) if parts else "no samples"
@@ -0,0 +1,136 @@
+import re
+from difflib import SequenceMatcher
+from dataclasses import dataclass, field
+from typing import Optional
+from IncomeParser import INCOME_PATTERN, parse_income
+
+# Lowest to highest. "Brainrot God" nameplates are matched by "brainrot".
+ALL_RARITIES = [
+    "common", "rare", "epic", "legendary",
+    "mythic", "brainrot", "secret"
+]
+
+# Similarity a misread word needs to count as a rarity when no rarity is spelled exactly, e.g. "legendory"
+FUZZY_CUTOFF = 0.75
+
+
+@dataclass
+class Detection:
+    """What a single scan of an NPC nameplate found."""
+    rarity: Optional[str] = None  # Lowercase rarity, one of ALL_RARITIES
+    income: Optional[float] = None  # Income per second, if it could be parsed
+    income_str: Optional[str] = None  # The income text between "$" and "/s"
+    income_error: Optional[str] = None  # Why income_str could not be parsed
+    name: Optional[str] = None  # Text line just above the rarity, if any
+    lines: list = field(default_factory=list)  # The (text, coords) lines that were parsed
+
+    @property
+    def partial(self):
+        """True if some text was read but not both the rarity and the income, e.g. mid-animation."""
+        return bool(self.lines) and (self.rarity is None or self.income is None)
+
+
+class NameplateParser:
+    """
+    Extracts rarity, income and name from OCR'd nameplate lines in one pass.
+
+    Every line is tokenized once with a single precompiled pattern that matches
+    incomes ("$1.5k/s"), rarities and plain prices ("$250"), instead of
+    searching the whole OCR result again for every rarity. Only when no rarity
+    is spelled exactly are the plain lines' words compared to the rarities,
+    so OCR misreads like "mythlc" still count.
+    """
+
+    def __init__(self, rarities=ALL_RARITIES, fuzzy_cutoff=FUZZY_CUTOFF):
+        """
+        :param rarities: Rarity keywords from lowest to highest.
+        :param fuzzy_cutoff: Minimum difflib ratio for a misread rarity, or None to only accept exact ones.
+        """
+        self.rarities = list(rarities)
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._rank = {rarity: index for index, rarity in enumerate(self.rarities)}
+        rarity_alternatives = "|".join(re.escape(r) for r in sorted(self.rarities, key=len, reverse=True))
+        self._token_pattern = re.compile(
+            INCOME_PATTERN.pattern +
+            rf"|\b(?P<rarity>{rarity_alternatives})\b"
+            r"|(?P<price>\$)"
+        )
+
+    def parse(self, lines):
+        """
+        Parses the lines returned by WindowManager.get_words_in_bounding_box.
+
+        When several incomes are present the last one wins, and when several
+        rarities are present the lowest one wins, so a stray low-rarity label
+        never gets a purchase approved.
+
+        :param lines: A list of (lowercase text, (x, y)) tuples, top to bottom.
+        :return: A Detection.
+        """
+        detection = Detection(lines=lines)
+        rarity_line = None
+        last_plain_line = None
+        name_for_rarity = None
+        plain_lines = []
+
+        for index, (text, _) in enumerate(lines):
+            is_plain = True
+            for token in self._token_pattern.finditer(text):
+                is_plain = False
+                kind = token.lastgroup
+                if kind == "income":
+                    detection.income_str = token.group("income")
+                elif kind == "rarity":
+                    rarity = token.group("rarity")
+                    if detection.rarity is None or self._rank[rarity] < self._rank[detection.rarity]:
+                        detection.rarity = rarity
+                        rarity_line = index
+                        name_for_rarity = last_plain_line
+
+            if is_plain:
+                last_plain_line = index
+                plain_lines.append(index)
+
+        if detection.rarity is None and self.fuzzy_cutoff is not None:
+            previous_plain_line = None
+            for index in plain_lines:
+                rarity = self._closest_rarity(lines[index][0])
+                if rarity is not None and (detection.rarity is None
+                                           or self._rank[rarity] < self._rank[detection.rarity]):
+                    detection.rarity = rarity
+                    rarity_line = index
+                    name_for_rarity = previous_plain_line
+                previous_plain_line = index
+
+        if detection.income_str is not None:
+            try:
+                detection.income = parse_income(detection.income_str)
+            except (ValueError, TypeError) as e:
+                detection.income_error = str(e)
+
+        if rarity_line is not None and name_for_rarity is not None:
+            detection.name = lines[name_for_rarity][0]
+        return detection
+
+    def _closest_rarity(self, text):
+        """Returns the lowest rarity some word of the text is similar enough to, or None."""
+        for rarity in self.rarities:
+            for word in text.split():
+                if SequenceMatcher(None, word, rarity).ratio() >= self.fuzzy_cutoff:
+                    return rarity
+        return None
+
+
+if __name__ == "__main__":
+    # Throughput benchmark on the recorded OCR outputs the tests use (see test_NameplateParser.py)
+    import timeit
+    from test_NameplateParser import RECORDED
+
+    recorded = [lines for lines, _ in RECORDED] + [[]]
+    parser = NameplateParser()
+    for lines in recorded:
+        print(parser.parse(lines))
+
+    runs = 20000
+    seconds = min(timeit.repeat(lambda: [parser.parse(lines) for lines in recorded], number=runs // len(recorded), repeat=3))
+    print(f"{runs / seconds:,.0f} nameplates/s ({seconds / runs * 1e6:.1f} us each)")
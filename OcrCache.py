@@ -0,0 +1,115 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+from TextLocator import find_text_regions
+
+# Brightest-channel level from which a pixel counts as glyph, not background. Nameplate
+# text is bright (white or saturated rarity colors) with a dark outline.
+TEXT_LEVEL = 180
+
+
+def content_digest(pixels):
+    """
+    Computes an exact digest of an RGB crop.
+
+    Any changed pixel changes the digest, so a region whose text changed, even
+    by one character of the income, never matches an earlier read. A coarse
+    perceptual hash can't promise that: small glyphs barely move its cell means.
+
+    :param pixels: An RGB uint8 array of shape (height, width, 3).
+    :return: The digest as bytes.
+    """
+    return hashlib.blake2b(np.ascontiguousarray(pixels).data, digest_size=16).digest()
+
+
+def text_digest(pixels, text_level=TEXT_LEVEL):
+    """
+    Computes a digest of only the text in an RGB crop.
+
+    The crop is reduced to a bit mask of the bright pixels inside its text bands
+    (see TextLocator.find_text_regions), trimmed to the glyphs, so the scene
+    moving behind a nameplate doesn't change the digest while any change to the
+    glyphs, such as one digit of the income, does. Where the glyphs are is part
+    of the digest, so a hit never returns word coordinates for text that has
+    since moved. Crops without a text band fall back to content_digest.
+
+    :param pixels: An RGB uint8 array of shape (height, width, 3).
+    :param text_level: See TEXT_LEVEL.
+    :return: The digest as bytes.
+    """
+    regions = find_text_regions(pixels)
+    if not regions:
+        return content_digest(pixels)
+    mask = np.zeros(pixels.shape[:2], dtype=bool)
+    for left, top, right, bottom in regions:
+        mask[top:bottom, left:right] = pixels[top:bottom, left:right].max(axis=2) >= text_level
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return content_digest(pixels)
+    columns = np.flatnonzero(mask.any(axis=0))
+    top, bottom, left, right = rows[0], rows[-1] + 1, columns[0], columns[-1] + 1
+    digest = hashlib.blake2b(np.array((left, top, right, bottom), dtype=np.int32).tobytes(), digest_size=16)
+    digest.update(np.packbits(mask[top:bottom, left:right]).tobytes())
+    return digest.digest()
+
+
+class OcrCache:
+    """
+    LRU cache of OCR results keyed by the text in the OCR'd region.
+
+    When the region shows the same text, in the same place, as one OCR'd
+    recently, the stored result is returned and the OCR call is skipped
+    entirely, even if the background behind the text changed.
+    """
+
+    def __init__(self, capacity=32):
+        """
+        :param capacity: Maximum number of results kept.
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def key_for(self, bounding_box, pixels):
+        """Returns the cache key for a region and its current pixels."""
+        return bounding_box, text_digest(pixels)
+
+    def get(self, key):
+        """
+        Looks up a result by key.
+
+        :return: The cached value, or None on a miss.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Stores a result, evicting the least recently used one if the cache is full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops every cached result."""
+        self._entries.clear()
+
+    def stats(self):
+        """
+        Returns a summary of how many OCR calls the cache has saved.
+
+        :return: A dict with 'hits', 'misses' and 'hit_rate' (0.0-1.0).
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,296 @@
+"""
+Runs the GameActions.scan_npcs decision pipeline headlessly against recorded data.
+
+Usage:
+    python ReplayHarness.py <frames_dir | ocr.jsonl> [--min-income N] [--min-rarity R] ...
+
+A frames directory is played back one frame per scan tick. If it contains an
+ocr.jsonl file, its records are used as the OCR output for the matching frames;
+otherwise OCR returns nothing unless --ocr-backend is given. A bare .jsonl file
+replays stored OCR results only. Each JSONL record looks like:
+    {"frame": 12, "lines": [["legendary", [379, 324]], ["$1.2k/s", [380, 347]]]}
+("frame" is optional; without it, records are consumed one per OCR call. Without
+recorded frames, records with a frame are played first, in frame order).
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from ActionQueue import ActionQueue
+from Clock import FakeClock
+from Events import Events
+from FrameCache import FrameCache
+from FrameSource import DirectoryFrameSource, EndOfRecording
+from GameActions import GameActions
+from InputScript import RecordingBackend, ScriptRunner
+from ScanScheduler import AdaptiveCadence
+
+
+class FakeInputManager:
+    """Records every input instead of sending it. Timed presses advance the fake clock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.events = []  # (time, method, args, kwargs)
+        self.on_key_press = None  # Optional callback(key)
+
+    def _record(self, method, *args, **kwargs):
+        self.events.append((self.clock.time(), method, args, kwargs))
+
+    def click(self, x, y, button='left'):
+        self._record("click", x, y, button=button)
+        self.clock.advance(0.1)
+
+    def move_mouse(self, x, y):
+        self._record("move_mouse", x, y)
+
+    def drag_mouse(self, start_x, start_y, end_x, end_y, button='left'):
+        self._record("drag_mouse", start_x, start_y, end_x, end_y, button=button)
+        self.clock.advance(0.6)
+
+    def scroll(self, *args, **kwargs):
+        self._record("scroll", *args, **kwargs)
+
+    def key_press(self, *args, **kwargs):
+        self._record("key_press", *args, **kwargs)
+        self.clock.advance(kwargs.get("duration", 0))
+        if self.on_key_press:
+            self.on_key_press(args[0])
+
+    def run_script(self, script, stop_event=None, settle=None):
+        self._record("run_script", script.name)
+        backend = RecordingBackend(timer=self.clock.time)
+        report = ScriptRunner(backend, settle=settle, timer=self.clock.time, sleep=self.clock.advance, spin=0).run(script, stop_event)
+        self.events.extend((timestamp, f"key_{action}", (key,), {}) for timestamp, action, key in backend.events)
+        return report
+
+
+class FakeWindowManager:
+    """
+    Serves recorded frames and OCR results through the same methods GameActions uses on WindowManager.
+    """
+
+    def __init__(self, clock, frame_source=None, ocr_records=None, ocr_reader=None, frame_size=(800, 600)):
+        """
+        :param clock: The FakeClock driving the replay. Frames advance when it does.
+        :param frame_source: Optional FrameSource with the recorded frames.
+        :param ocr_records: Optional list of JSONL records with stored OCR output.
+        :param ocr_reader: Optional screen_ocr Reader used to OCR frames that have no stored record.
+        :param frame_size: (width, height) of the blank frame served when there are no recorded frames.
+        """
+        self.clock = clock
+        self.frame_source = FrameCache(frame_source, ttl=0.05, clock=clock.time).open() if frame_source else None
+        self.frame_cache = self.frame_source
+        self.ocr_cache = None
+        self.ocr_reader = ocr_reader
+        self.blank_frame = np.zeros((frame_size[1], frame_size[0], 3), dtype=np.uint8)
+        self.records_by_frame = {}
+        self.sequential_records = []
+        for record in ocr_records or []:
+            lines = [(text, tuple(coords)) for text, coords in record["lines"]]
+            if "frame" in record:
+                self.records_by_frame[record["frame"]] = lines
+            else:
+                self.sequential_records.append(lines)
+        if self.frame_source is None and self.records_by_frame:
+            # Without frames to match, frame-keyed records are played one per OCR call in frame order
+            self.sequential_records = [self.records_by_frame[frame] for frame in sorted(self.records_by_frame)] \
+                + self.sequential_records
+            self.records_by_frame = {}
+        self._next_record = 0
+        self._holds = 0
+        self._last_frame = None
+
+    @contextmanager
+    def hold_frame(self):
+        """
+        Serves the current frame, unchanged, to every grab inside the with-block.
+        Settle polls run inside one, so they don't use up recorded frames meant for scan ticks.
+        """
+        self._holds += 1
+        try:
+            yield
+        finally:
+            self._holds -= 1
+
+    def get_center_coordinates(self):
+        return self.blank_frame.shape[1] // 2, self.blank_frame.shape[0] // 2
+
+    def grab_frame(self, bounding_box=None, fresh=False):
+        if fresh and not self._holds and self.frame_cache is not None:
+            self.frame_cache.invalidate()
+        if self._holds and self._last_frame is not None:
+            frame = self._last_frame
+        else:
+            frame = self.frame_source.grab() if self.frame_source else self.blank_frame
+            self._last_frame = frame
+        if bounding_box is not None:
+            left, top, right, bottom = bounding_box
+            frame = frame[top:bottom, left:right]
+        return frame
+
+    def get_color_at_pixel(self, x, y):
+        r, g, b = self.grab_frame()[y, x]
+        return int(r), int(g), int(b)
+
+    def find_color(self, hex_color, threshold=10, roi=None):
+        return None
+
+    def save_screenshot(self, filename, bounding_box=None):
+        pass
+
+    def get_words_in_bounding_box(self, bounding_box, use_cache=True, localize_text=False):
+        return self.read_words(self.grab_frame(bounding_box), bounding_box)
+
+    def read_words(self, pixels, bounding_box, use_cache=True, localize_text=False):
+        return self._read_lines(pixels), None
+
+    def _read_lines(self, pixels):
+        if self.frame_source is not None:
+            frame_index = self.frame_source.source.index - 1
+            if frame_index in self.records_by_frame:
+                return self.records_by_frame[frame_index]
+        if self._next_record < len(self.sequential_records):
+            self._next_record += 1
+            return self.sequential_records[self._next_record - 1]
+        if self.frame_source is None:
+            raise EndOfRecording("No more recorded OCR results.")
+        if self.ocr_reader is not None:
+            from PIL import Image
+            result = self.ocr_reader.read_image(Image.fromarray(pixels))
+            return [(" ".join(word.text for word in line.words).lower(), (0, 0)) for line in result.result.lines if line.words]
+        return []
+
+
+def load_records(path):
+    """Loads OCR records from a JSONL file, one JSON object per line."""
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def replay(frames_dir=None, ocr_records=None, ocr_reader=None, min_income=1000, min_rarity="N/A",
+           duration=None, skip_static_frames=False, change_threshold=2.0, cadence=None):
+    """
+    Runs scan_npcs against recorded data and returns a report.
+
+    :param frames_dir: Optional directory of recorded frames (played back once, not looped).
+    :param ocr_records: Optional list of OCR records (see the module docstring).
+    :param ocr_reader: Optional screen_ocr Reader to OCR frames without a stored record.
+    :param min_income: Same as scan_npcs.
+    :param min_rarity: Same as scan_npcs.
+    :param duration: Optional virtual scan time in seconds. Defaults to running until the recording ends.
+    :param skip_static_frames: Same as scan_npcs. Needs recorded frames.
+    :param change_threshold: Same as scan_npcs.
+    :param cadence: Same as scan_npcs (an AdaptiveCadence, or None for the fixed 0.2 s wait).
+    :return: A dict with the detections, decisions, throughput and the per-stage latency summary
+             from GameActions.stage_timings.
+    """
+    clock = FakeClock()
+    frame_source = DirectoryFrameSource(frames_dir, loop=False, preload=True) if frames_dir else None
+    window_manager = FakeWindowManager(clock, frame_source, ocr_records, ocr_reader)
+    input_manager = FakeInputManager(clock)
+    game_actions = GameActions(window_manager, input_manager, threading.Event(), ActionQueue(clock=clock.time), clock=clock)
+
+    # A recording doesn't react to input, so waiting for the screen to settle would only skip frames
+    wait_until = game_actions.wait_until
+
+    def held_wait_until(*args, **kwargs):
+        with window_manager.hold_frame():
+            return wait_until(*args, **kwargs)
+
+    game_actions.wait_until = held_wait_until
+
+    detections = []
+    parse = game_actions.nameplate_parser.parse
+
+    def recording_parse(lines):
+        detection = parse(lines)
+        detections.append({"time": round(clock.time(), 3), "rarity": detection.rarity,
+                           "income": detection.income, "name": detection.name, "bought": False})
+        return detection
+
+    def on_key_press(key):
+        # scan_npcs presses 'e' right after parsing a nameplate it wants
+        if key == 'e' and detections:
+            detections[-1]["bought"] = True
+
+    game_actions.nameplate_parser.parse = recording_parse
+    input_manager.on_key_press = on_key_press
+
+    wall_start = time.perf_counter()
+    try:
+        game_actions.scan_npcs(min_rarity=min_rarity, min_income=min_income, stop_time=duration,
+                               skip_static_frames=skip_static_frames, change_threshold=change_threshold,
+                               cadence=cadence)
+    except EndOfRecording:
+        pass  # The recording ran out
+    wall_seconds = time.perf_counter() - wall_start
+
+    skipped = game_actions.change_detector.skipped if skip_static_frames else 0
+    ticks = len(detections) + skipped
+
+    return {
+        "ticks": ticks,
+        "ocr_ticks": len(detections),
+        "skipped_ticks": skipped,
+        "buys": sum(1 for d in detections if d["bought"]),
+        "virtual_seconds": clock.time(),
+        "wall_seconds": wall_seconds,
+        "ticks_per_second": ticks / wall_seconds if wall_seconds else 0.0,
+        "latency": game_actions.stage_timings.summary(),
+        "detections": detections,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the NPC scan decision pipeline against recorded data.")
+    parser.add_argument("source", help="A directory of recorded frames, or an OCR-result .jsonl file")
+    parser.add_argument("--min-income", type=float, default=1000)
+    parser.add_argument("--min-rarity", default="N/A")
+    parser.add_argument("--duration", type=float, default=None, help="Virtual seconds to scan for")
+    parser.add_argument("--skip-static", action="store_true", help="Enable the frame-difference OCR gate")
+    parser.add_argument("--change-threshold", type=float, default=2.0)
+    parser.add_argument("--adaptive", action="store_true", help="Use the adaptive scan cadence with default settings")
+    parser.add_argument("--ocr-backend", default=None,
+                        help="screen_ocr backend (e.g. tesseract) used for frames without a stored record")
+    parser.add_argument("--decisions", action="store_true", help="Print every detection")
+    args = parser.parse_args()
+
+    frames_dir = args.source if os.path.isdir(args.source) else None
+    records_path = os.path.join(args.source, "ocr.jsonl") if frames_dir else args.source
+    ocr_records = load_records(records_path) if os.path.exists(records_path) else None
+
+    ocr_reader = None
+    if args.ocr_backend:
+        from screen_ocr import Reader
+        ocr_reader = Reader.create_reader(backend=args.ocr_backend)
+
+    if args.decisions:
+        Events().subscribe("debug", lambda message: print(f"  [debug] {message}"), mode="sync")
+
+    report = replay(frames_dir, ocr_records, ocr_reader, args.min_income, args.min_rarity, args.duration,
+                    skip_static_frames=args.skip_static and frames_dir is not None,
+                    change_threshold=args.change_threshold,
+                    cadence=AdaptiveCadence() if args.adaptive else None)
+
+    if args.decisions:
+        for detection in report["detections"]:
+            print(f"t={detection['time']:>9.3f}s  {'BUY ' if detection['bought'] else 'skip'}  "
+                  f"rarity={detection['rarity']}  income={detection['income']}  name={detection['name']}")
+
+    print(f"Ticks: {report['ticks']} ({report['ocr_ticks']} OCR'd, {report['skipped_ticks']} skipped), "
+          f"buys: {report['buys']}")
+    print(f"Virtual time: {report['virtual_seconds']:.1f}s, wall time: {report['wall_seconds']:.3f}s, "
+          f"{report['ticks_per_second']:,.0f} ticks/s")
+    for stage, stats in report["latency"].items():
+        if stats["count"]:
+            print(f"  {stage:<8} mean {stats['mean'] * 1000:7.3f} ms  p50 {stats['p50'] * 1000:7.3f} ms  "
+                  f"p95 {stats['p95'] * 1000:7.3f} ms  p99 {stats['p99'] * 1000:7.3f} ms")
+
+if __name__ == "__main__":
+    main()
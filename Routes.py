@@ -0,0 +1,133 @@
+"""
+Movement routes for plot navigation, loaded from data/routes.json.
+
+Routes are written for a plot on the left side of the map and mirrored for the
+right side using the file's "mirror" key map. Each route is a list of steps:
+    {"hold": "a", "for": 0.55}               hold one key (or a list of keys) down
+    {"hold": "w", "for": 0.4, "overlap": 0.1} start the hold before the previous one ends
+    {"press": "e"}                            tap a key
+    {"wait": 0.2}                             pause
+    {"settle": 0.5}                           wait until the screen stops moving, at most 0.5 s
+Every route is compiled once into an InputScript per side when the RouteBook is loaded.
+"""
+import json
+
+from InputScript import InputScript
+
+STEP_KINDS = ("hold", "press", "wait", "settle")
+
+
+def _merge_holds(holds):
+    """Merges overlapping or touching holds of the same key into one, so it is never released mid-route."""
+    merged = []
+    for start, end, key in sorted(holds, key=lambda hold: (hold[2], hold[0])):
+        if merged and merged[-1][2] == key and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end), key)
+        else:
+            merged.append((start, end, key))
+    return sorted(merged)
+
+
+def compile_route(name, steps, mirror=None):
+    """
+    Compiles a route into an InputScript.
+
+    Adjacent waits become one, adjacent settles become the longest of them, and
+    overlapping holds of the same key are merged.
+
+    :param name: The route name, used for the script name and error messages.
+    :param steps: The list of step dicts.
+    :param mirror: Optional {key: mirrored key} map applied to every key.
+    :return: The InputScript.
+    :raises ValueError: If a step is malformed.
+    """
+    mirror = mirror or {}
+    script = InputScript(name)
+    holds = []
+    cursor = 0.0
+    last_hold_end = 0.0
+    length = 0.0
+    pending_settle = None
+
+    def flush_segment():
+        nonlocal holds, cursor, last_hold_end, length
+        for start, end, key in _merge_holds(holds):
+            script.hold(key, end - start, at=start)
+        if length:
+            script.wait(length)
+        holds, cursor, last_hold_end, length = [], 0.0, 0.0, 0.0
+
+    for index, step in enumerate(steps):
+        kinds = [kind for kind in STEP_KINDS if kind in step]
+        if len(kinds) != 1:
+            raise ValueError(f"Route '{name}' step {index}: expected exactly one of {', '.join(STEP_KINDS)}, got {step}")
+        kind = kinds[0]
+
+        if kind == "settle":
+            pending_settle = max(pending_settle or 0.0, float(step["settle"]))
+            continue
+        if pending_settle is not None:
+            flush_segment()
+            script.settle(pending_settle)
+            pending_settle = None
+
+        if kind == "wait":
+            cursor += float(step["wait"])
+            length = max(length, cursor)
+        elif kind in ("hold", "press"):
+            keys = step[kind] if isinstance(step[kind], list) else [step[kind]]
+            duration = float(step.get("for", 0)) if kind == "hold" else 0.0
+            if duration < 0:
+                raise ValueError(f"Route '{name}' step {index}: 'for' must not be negative")
+            start = max(0.0, last_hold_end - float(step.get("overlap", 0))) if "overlap" in step else cursor
+            for key in keys:
+                holds.append((start, start + duration, mirror.get(key, key)))
+            cursor = last_hold_end = start + duration
+            length = max(length, cursor)
+
+    flush_segment()
+    if pending_settle is not None:
+        script.settle(pending_settle)
+    return script.finish()
+
+
+class RouteBook:
+    """The compiled routes from a routes file, for both plot sides."""
+
+    def __init__(self, path='data/routes.json'):
+        """
+        Loads and compiles every route.
+
+        :param path: Path to the JSON routes file.
+        :raises ValueError: If a route is malformed.
+        """
+        with open(path, 'r') as f:
+            data = json.load(f)
+        mirror = data.get("mirror", {})
+        self.routes = data["routes"]
+        self.plans = {}
+        for name, steps in self.routes.items():
+            self.plans[(name, False)] = compile_route(name, steps)
+            self.plans[(name, True)] = compile_route(name, steps, mirror)
+
+    def plan(self, name, plot_side_right):
+        """
+        Returns the compiled InputScript for a route.
+
+        :param name: The route name.
+        :param plot_side_right: Whether the plot is on the right side; None counts as left.
+        """
+        return self.plans[(name, bool(plot_side_right))]
+
+
+if __name__ == "__main__":
+    # Prints every compiled plan and its worst-case duration
+    book = RouteBook()
+    for (name, right), script in sorted(book.plans.items()):
+        print(f"{name} ({'right' if right else 'left'} plot): up to {script.duration():.2f}s")
+        for step in script.steps:
+            if step[0] == "settle":
+                print(f"    settle, at most {step[1]:.2f}s")
+            else:
+                events = ", ".join(f"{action} {key} @{offset:.2f}" for offset, action, key in step[1])
+                print(f"    {step[2]:.2f}s: {events}")
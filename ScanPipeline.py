@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import deque
+
+
+class FrameRing:
+    """
+    Bounded, thread-safe ring of captured frames where the consumer only wants the newest one.
+
+    When the ring is full the oldest frame is dropped, so a slow consumer never
+    makes the producer wait and never works on a stale frame.
+    """
+
+    def __init__(self, capacity=2):
+        """
+        :param capacity: Maximum number of frames held at once.
+        """
+        self._frames = deque(maxlen=capacity)
+        self._condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._condition:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(item)
+            self._condition.notify_all()
+
+    def take_newest(self, timeout):
+        """
+        Removes and returns the newest item, discarding any older ones.
+
+        :param timeout: Seconds to wait for an item.
+        :return: The item, or None if nothing arrived in time.
+        """
+        with self._condition:
+            if not self._frames and not self._condition.wait_for(lambda: self._frames, timeout):
+                return None
+            item = self._frames.pop()
+            self.dropped += len(self._frames)
+            self._frames.clear()
+            return item
+
+    def wake(self):
+        """Wakes up any consumer blocked in take_newest()."""
+        with self._condition:
+            self._condition.notify_all()
+
+
+class ScanPipeline:
+    """
+    Overlaps capture, OCR and decision for the NPC scan.
+
+    A capture thread grabs the scan region into a FrameRing at a fixed interval,
+    an OCR worker always takes the newest frame (dropping stale ones), parses it
+    and publishes the newest Detection. The decision and the buy key press stay on
+    the thread that calls next_detection(), which is the bot thread.
+    """
+
+    def __init__(self, window_manager, parser, bounding_box, stop_event, stage_timings,
+                 capture_interval=0.05, change_detector=None, localize_text=True):
+        """
+        :param window_manager: Provides grab_frame() and read_words().
+        :param parser: A NameplateParser.
+        :param bounding_box: The client-area box to scan.
+        :param stop_event: The bot's stop event; the workers exit as soon as it is set.
+        :param stage_timings: StageTimings that receive the capture, ocr and parse samples.
+        :param capture_interval: Minimum seconds between two captures.
+        :param change_detector: Optional ChangeDetector; unchanged frames are not OCR'd unless the last read was partial.
+        :param localize_text: Passed to WindowManager.read_words.
+        """
+        self.window_manager = window_manager
+        self.parser = parser
+        self.bounding_box = bounding_box
+        self.stop_event = stop_event
+        self.stage_timings = stage_timings
+        self.capture_interval = capture_interval
+        self.change_detector = change_detector
+        self.localize_text = localize_text
+
+        self.frames = FrameRing(capacity=2)
+        self.detections = FrameRing(capacity=1)
+        self.error = None
+        self._halt = threading.Event()
+        self._threads = []
+
+    def _running(self):
+        return not (self._halt.is_set() or self.stop_event.is_set())
+
+    def _fail(self, error):
+        self.error = error
+        self._halt.set()
+        self.detections.wake()
+
+    def _capture_loop(self):
+        try:
+            while self._running():
+                started = time.perf_counter()
+                with self.stage_timings.measure("capture"):
+                    # Copy out of the frame source's reused buffer before handing it to another thread
+                    pixels = self.window_manager.grab_frame(self.bounding_box).copy()
+                self.frames.put((pixels, started))
+                remaining = self.capture_interval - (time.perf_counter() - started)
+                if remaining > 0:
+                    self._halt.wait(remaining)
+        except Exception as e:
+            self._fail(e)
+
+    def _ocr_loop(self):
+        try:
+            partial = False
+            while self._running():
+                item = self.frames.take_newest(timeout=0.1)
+                if item is None:
+                    continue
+                pixels, captured_at = item
+                # A partly read nameplate is OCR'd again even if it looks unchanged
+                if self.change_detector is not None and not self.change_detector.has_changed(pixels) and not partial:
+                    continue
+                with self.stage_timings.measure("ocr"):
+                    lines, _ = self.window_manager.read_words(pixels, self.bounding_box, localize_text=self.localize_text)
+                with self.stage_timings.measure("parse"):
+                    detection = self.parser.parse(lines)
+                partial = detection.partial
+                self.detections.put((detection, captured_at, pixels))
+        except Exception as e:
+            self._fail(e)
+
+    def start(self):
+        """Starts the capture and OCR workers."""
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="ScanCapture", daemon=True),
+            threading.Thread(target=self._ocr_loop, name="ScanOCR", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def next_detection(self, timeout=0.1):
+        """
+        Returns the newest detection not yet handed out.
+
+        :param timeout: Seconds to wait for one.
+        :return: A tuple (detection, captured_at, pixels) where captured_at is the perf_counter time of
+                 the frame's capture and pixels the frame itself, or None if nothing new arrived in time.
+        :raises Exception: Whatever stopped a worker, so failures surface on the bot thread.
+        """
+        item = self.detections.take_newest(timeout)
+        if self.error is not None:
+            raise self.error
+        return item
+
+    def stop(self):
+        """Stops the workers and waits for them to finish their current step."""
+        self._halt.set()
+        self.frames.wake()
+        self.detections.wake()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def stats(self):
+        """Returns how many frames and detections were dropped as stale."""
+        return {"frames_dropped": self.frames.dropped, "detections_dropped": self.detections.dropped}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,79 @@
+class AdaptiveCadence:
+    """
+    Chooses how long the scan loop waits before its next tick.
+
+    Polls at min_interval right after the scan region changed or a nameplate was
+    only partly read, backs off exponentially up to max_interval while nothing
+    happens, and never polls so fast that OCR would use more than cpu_budget
+    of one core.
+    """
+
+    def __init__(self, min_interval=0.05, max_interval=1.0, backoff=1.5, cpu_budget=0.5, smoothing=0.2):
+        """
+        :param min_interval: Shortest wait between ticks, in seconds.
+        :param max_interval: Longest wait between ticks while idle, in seconds.
+        :param backoff: Factor the wait grows by on every idle tick.
+        :param cpu_budget: Largest fraction (0-1] of one core that OCR may use.
+        :param smoothing: Weight of the newest sample in the OCR-time moving average.
+        """
+        if not 0 < cpu_budget <= 1:
+            raise ValueError("cpu_budget must be in (0, 1].")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+        self.smoothing = smoothing
+        self.interval = min_interval
+        self.reason = "fast"
+        self.average_ocr_seconds = None
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Builds a cadence from the settings dictionary.
+
+        :return: An AdaptiveCadence, or None if 'adaptive_cadence' is turned off.
+        """
+        if not settings.get("adaptive_cadence", True):
+            return None
+        return cls(
+            min_interval=settings.get("scan_min_interval", 0.05),
+            max_interval=settings.get("scan_max_interval", 1.0),
+            backoff=settings.get("scan_backoff", 1.5),
+            cpu_budget=settings.get("ocr_cpu_budget", 0.5),
+        )
+
+    def record_ocr(self, seconds):
+        """Feeds the duration of one OCR call into the moving average."""
+        if self.average_ocr_seconds is None:
+            self.average_ocr_seconds = seconds
+        else:
+            self.average_ocr_seconds += self.smoothing * (seconds - self.average_ocr_seconds)
+
+    def budget_floor(self):
+        """Shortest interval that keeps OCR within the CPU budget."""
+        if not self.average_ocr_seconds:
+            return 0.0
+        # ocr / (ocr + interval) <= budget  =>  interval >= ocr * (1 - budget) / budget
+        return self.average_ocr_seconds * (1 - self.cpu_budget) / self.cpu_budget
+
+    def next_interval(self, active):
+        """
+        Picks the wait before the next tick.
+
+        :param active: True if this tick saw a change or a partial detection, False if it was idle.
+        :return: The interval in seconds. self.reason says why it was chosen.
+        """
+        if active:
+            interval, reason = self.min_interval, "fast"
+        else:
+            interval = min(self.interval * self.backoff, self.max_interval)
+            reason = "idle" if interval >= self.max_interval else "backing off"
+
+        floor = self.budget_floor()
+        if floor > interval:
+            interval, reason = floor, "cpu budget"
+
+        self.interval = interval
+        self.reason = reason
+        return interval
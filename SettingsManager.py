@@ -13,9 +13,32 @@ class SettingsManager:
         return {
             "auto_collect_money": True,
             "collect_money_interval": 300,
+            "collect_max_defer": 30,  # Seconds collection may wait past its interval for a quiet moment
+            "ev_collect_scheduling": True,  # Collect when it beats scanning; collect_money_interval is the longest gap
+            "collect_min_interval": 60,
+            "match_value_seconds": 600,  # Seconds of a bought brainrot's income counted as its value
+            "plot_income": 0,  # Plot income ($/s) at start, if known
+            "schedule_trace_path": "",  # Optional JSONL trace for 'python CashScheduler.py'
             "auto_scan_npcs": True,
             "income_threshold": 1000,
             "min_rarity": "Rare",
+            "skip_static_frames": False,  # Only OCR the scan region when its text bands change
+            "change_threshold": 2.0,
+            "pipelined_scan": False,  # Capture and OCR on background threads
+            "capture_interval": 0.05,
+            "adaptive_cadence": True,  # Scan faster on changes, back off while idle
+            "scan_min_interval": 0.05,
+            "scan_max_interval": 1.0,
+            "scan_backoff": 1.5,
+            "ocr_cpu_budget": 0.5,  # Max fraction of one core spent on OCR
+            "webhook_screenshots": False,  # Attach the nameplate to Discord success messages
+            "screenshot_format": "webp",  # "webp" or "jpeg"
+            "screenshot_max_side": 320,
+            "screenshot_max_bytes": 200000,
+            "session_log": True,  # Record every event to logs/session.jsonl
+            "session_log_dir": "logs",
+            "session_log_max_mb": 10,  # Size at which the file is rotated and compressed
+            "session_log_backups": 20,
             "im_poor": False,  # Flag for donation banner
         }
 
@@ -0,0 +1,61 @@
+import io
+
+from PIL import Image
+
+from TextLocator import find_text_regions
+
+CONTENT_TYPES = {"jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+class Snapshot:
+    """
+    A nameplate image waiting to be attached to a webhook message.
+
+    Holds a copy of pixels the bot already captured; cropping to the text and
+    encoding happen in encode(), which the webhook dispatcher calls on its own
+    thread, so the scan loop only pays for the copy.
+    """
+
+    def __init__(self, pixels, image_format="webp", max_side=320, max_bytes=200_000, name="nameplate"):
+        """
+        :param pixels: An RGB uint8 array the Snapshot may keep, i.e. a copy, not a reused frame buffer.
+        :param image_format: "webp" or "jpeg".
+        :param max_side: Longest side of the encoded image in pixels.
+        :param max_bytes: Quality is lowered until the image fits in this many bytes.
+        :param name: File name without extension.
+        """
+        if image_format not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported image format '{image_format}'. Use one of: {', '.join(CONTENT_TYPES)}")
+        self.pixels = pixels
+        self.image_format = image_format
+        self.max_side = max_side
+        self.max_bytes = max_bytes
+        self.filename = f"{name}.{'jpg' if image_format == 'jpeg' else image_format}"
+
+    def _crop(self):
+        """Crops to the union of the text bands, which is the nameplate, or keeps everything if none are found."""
+        regions = find_text_regions(self.pixels)
+        if not regions:
+            return self.pixels
+        left = min(region[0] for region in regions)
+        top = min(region[1] for region in regions)
+        right = max(region[2] for region in regions)
+        bottom = max(region[3] for region in regions)
+        return self.pixels[top:bottom, left:right]
+
+    def encode(self):
+        """
+        Crops, scales down and encodes the image.
+
+        :return: A tuple (filename, data bytes, content type).
+        """
+        image = Image.fromarray(self._crop())
+        image.thumbnail((self.max_side, self.max_side))
+        data = b""
+        for quality in (80, 65, 50, 35, 20):
+            buffer = io.BytesIO()
+            image.save(buffer, format=self.image_format.upper(), quality=quality)
+            data = buffer.getvalue()
+            if len(data) <= self.max_bytes:
+                break
+        return self.filename, data, CONTENT_TYPES[self.image_format]
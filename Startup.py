@@ -0,0 +1,146 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from Events import Events
+
+
+class StartupTimer:
+    """
+    Records how long each part of startup takes, for the time-to-first-frame report.
+
+    Stages are timed spans (an import, window setup, a background warm-up) and
+    marks are points in time (GUI ready, Start pressed, first frame). Both are
+    stored as seconds since the timer was created, which for the module-level
+    STARTUP is as soon as main.py begins importing. Safe to use from any thread.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        """
+        :param clock: Returns the current time in seconds.
+        """
+        self.clock = clock
+        self.origin = clock()
+        self.stages = {}  # name -> (start, seconds, background)
+        self.marks = {}  # name -> seconds
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, background=False):
+        """
+        Times the body of a with-block as a stage.
+
+        :param name: e.g. "import gui".
+        :param background: True if the stage runs alongside the rest of startup instead of delaying it.
+        """
+        start = self.clock()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = (start - self.origin, self.clock() - start, background)
+
+    def mark(self, name, report=False):
+        """
+        Records the first time something happened; later calls with the same name are ignored.
+
+        :param name: e.g. "first frame".
+        :param report: If True and this is the first call, the report is emitted as a stats event.
+        :return: True if this was the first call.
+        """
+        with self._lock:
+            if name in self.marks:
+                return False
+            self.marks[name] = self.clock() - self.origin
+        if report:
+            Events().stats(f"Startup: {self.format()}", self.summary())
+        return True
+
+    def summary(self):
+        """
+        Returns the recorded timings.
+
+        :return: {"stages": {name: {"start", "seconds", "background"}}, "marks": {name: seconds}},
+                 all in seconds since the timer was created.
+        """
+        with self._lock:
+            return {
+                "stages": {name: {"start": start, "seconds": seconds, "background": background}
+                           for name, (start, seconds, background) in self.stages.items()},
+                "marks": dict(self.marks),
+            }
+
+    def format(self):
+        """
+        Formats the timings as a single log line, in order of time.
+
+        :return: e.g. "import gui 0.84s | ocr warm-up 2.10s (background) | @gui ready 0.95s | ..."
+        """
+        summary = self.summary()
+        events = [(stage["start"], f"{name} {stage['seconds']:.2f}s"
+                   + (" (background)" if stage["background"] else ""))
+                  for name, stage in summary["stages"].items()]
+        events += [(seconds, f"@{name} {seconds:.2f}s") for name, seconds in summary["marks"].items()]
+        parts = [text for _, text in sorted(events)]
+
+        marks = summary["marks"]
+        if "first frame" in marks and "bot start" in marks:
+            parts.append(f"first frame {marks['first frame'] - marks['bot start']:.2f}s after Start")
+        return " | ".join(parts) if parts else "no samples"
+
+
+STARTUP = StartupTimer()
+
+
+class Preload:
+    """
+    Builds an expensive object on a background thread so startup can continue meanwhile.
+
+    get() blocks until it is ready and records how long the caller had to wait,
+    which is the part of the load that was not hidden behind other startup work.
+    """
+
+    def __init__(self, name, factory, timer=STARTUP):
+        """
+        :param name: Stage name in the startup report, e.g. "ocr warm-up".
+        :param factory: Callable taking no arguments that returns the object.
+        :param timer: The StartupTimer to record to.
+        """
+        self.name = name
+        self.factory = factory
+        self.timer = timer
+        self._done = threading.Event()
+        self._value = None
+        self._error = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            with self.timer.stage(self.name, background=True):
+                self._value = self.factory()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+    def get(self):
+        """
+        Returns the object, waiting for the background thread if needed.
+        Errors raised by the factory are raised here. Builds it on the calling thread if start() was never called.
+        """
+        if self._thread is None:
+            with self.timer.stage(self.name):
+                self._value = self.factory()
+            self._thread = threading.current_thread()
+            self._done.set()
+        if not self._done.is_set():
+            with self.timer.stage(f"{self.name} wait"):
+                self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
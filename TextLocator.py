@@ -0,0 +1,99 @@
+from dataclasses import replace
+import numpy as np
+
+
+def find_text_regions(pixels, contrast=60, min_row_edges=3, min_height=6, merge_gap=3, padding=4):
+    """
+    Finds horizontal bands of a crop that likely contain text.
+
+    Text shows up as many strong horizontal intensity jumps. Those edges are
+    projected onto the rows to find bands, and each band is then trimmed to the
+    columns that contain edges.
+
+    :param pixels: An RGB uint8 array of shape (height, width, 3).
+    :param contrast: Minimum grayscale jump (0-255) between neighbouring pixels to count as an edge.
+    :param min_row_edges: Minimum number of edges for a row to count as part of a text band.
+    :param min_height: Bands shorter than this (before padding) are discarded as noise.
+    :param merge_gap: Bands separated by at most this many rows are merged into one.
+    :param padding: Pixels added around each band, clipped to the crop.
+    :return: A list of (left, top, right, bottom) tuples relative to the crop, top to bottom.
+    """
+    height, width = pixels.shape[:2]
+    gray = (pixels[..., 0].astype(np.int16) * 2 + pixels[..., 1].astype(np.int16) * 5 + pixels[..., 2]) >> 3
+    edges = np.abs(np.diff(gray, axis=1)) >= contrast
+
+    text_rows = np.flatnonzero(edges.sum(axis=1) >= min_row_edges)
+    if text_rows.size == 0:
+        return []
+
+    # Split the text rows into runs, tolerating small gaps inside a band
+    breaks = np.flatnonzero(np.diff(text_rows) > merge_gap + 1)
+    starts = np.concatenate(([text_rows[0]], text_rows[breaks + 1]))
+    ends = np.concatenate((text_rows[breaks], [text_rows[-1]])) + 1
+
+    regions = []
+    for top, bottom in zip(starts, ends):
+        if bottom - top < min_height:
+            continue
+        columns = np.flatnonzero(edges[top:bottom].any(axis=0))
+        left, right = columns[0], columns[-1] + 2  # +2: an edge sits between two pixels
+        regions.append((
+            int(max(left - padding, 0)),
+            int(max(top - padding, 0)),
+            int(min(right + padding, width)),
+            int(min(bottom + padding, height)),
+        ))
+    return regions
+
+
+def compose_regions(pixels, regions, gap=10):
+    """
+    Stacks the given regions of a crop into one compact image, so they can be OCR'd in a single call.
+
+    :param pixels: An RGB uint8 array of the crop.
+    :param regions: The (left, top, right, bottom) regions to keep, relative to the crop.
+    :param gap: Blank rows inserted between regions so lines don't merge.
+    :return: A tuple (composite, placements) where composite is the stacked RGB array and
+             placements lists (region, composite_top) for each region, for remap_result().
+    """
+    width = max(right - left for left, _, right, _ in regions)
+    height = sum(bottom - top for _, top, _, bottom in regions) + gap * (len(regions) - 1)
+    composite = np.zeros((height, width, 3), dtype=np.uint8)
+
+    placements = []
+    cursor = 0
+    for region in regions:
+        left, top, right, bottom = region
+        composite[cursor:cursor + bottom - top, :right - left] = pixels[top:bottom, left:right]
+        placements.append((region, cursor))
+        cursor += bottom - top + gap
+    return composite, placements
+
+
+def remap_result(result, placements, offset=(0, 0)):
+    """
+    Moves the words of an OCR result on a composite image back to where they are in the original crop.
+
+    :param result: The screen_ocr OcrResult for the composite image.
+    :param placements: The placements returned by compose_regions().
+    :param offset: (x, y) added to every word, e.g. the crop's position on screen.
+    :return: A new OcrResult of the same type with remapped word coordinates.
+    """
+    def placement_for(y):
+        for region, composite_top in placements:
+            if y < composite_top + region[3] - region[1]:
+                return region, composite_top
+        return placements[-1]
+
+    lines = []
+    for line in result.lines:
+        words = []
+        for word in line.words:
+            (left, top, _, _), composite_top = placement_for(word.top + word.height / 2)
+            words.append(replace(
+                word,
+                left=word.left + left + offset[0],
+                top=word.top - composite_top + top + offset[1],
+            ))
+        lines.append(replace(line, words=words))
+    return replace(result, lines=lines)
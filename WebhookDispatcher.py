@@ -0,0 +1,285 @@
+import json
+import queue
+import threading
+import time
+
+LEVEL_COLORS = {  # Discord's decimal color codes per log level
+    "info": 3447003,  # Blue
+    "warning": 16761095,  # Orange
+    "error": 15158332,  # Red
+    "success": 3066993,  # Green
+    "debug": 10181046,  # Purple
+}
+
+
+def make_log_embed(message, level, prefix, timestamp):
+    """
+    Builds the Discord embed for one Activity Log line.
+
+    :param message: The log message content.
+    :param level: The log level (info, warning, error, success, debug).
+    :param prefix: The log prefix (INFO, WARN, etc.).
+    :param timestamp: The timestamp string.
+    """
+    return {
+        "title": f"[{prefix}] Log Entry",
+        "description": message[:4096],
+        "color": LEVEL_COLORS.get(level, 9807270),  # Gray by default
+        "footer": {"text": f"Time: {timestamp}"},
+    }
+
+
+def _embed_chars(embed):
+    return len(embed.get("title", "")) + len(embed.get("description", "")) + len(embed.get("footer", {}).get("text", ""))
+
+
+class WebhookDispatcher:
+    """
+    Sends Discord webhook messages from a single background thread.
+
+    Embeds are queued without blocking (and counted as dropped when the bounded
+    queue is full), coalesced into messages of up to 10 embeds, and posted over
+    one pooled requests.Session. An embed with an image attachment is sent as
+    its own message, and the image is only encoded here, on the worker. 429
+    responses are retried after Retry-After, and the rate-limit headers of
+    successful responses pause the worker before the bucket runs out. Nothing
+    here emits Events, since log lines are what it sends.
+    """
+
+    MAX_EMBEDS = 10  # Discord's limit per message
+    MAX_EMBED_CHARS = 6000  # Discord's limit on the total text of a message's embeds
+
+    def __init__(self, username="Brainrot Macro Logger", max_queue=200, batch_window=0.5, timeout=5, max_retries=3,
+                 session=None):
+        """
+        :param username: Name the messages are posted under.
+        :param max_queue: Embeds held at most while waiting to be sent.
+        :param batch_window: Seconds to wait for more embeds before posting a message.
+        :param timeout: Seconds per HTTP request.
+        :param max_retries: Attempts after the first before a message is dropped.
+        :param session: Optional requests.Session. Created on first use by default.
+        """
+        self.username = username
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._session = session
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._held = None  # An item taken from the queue that did not fit in the previous message
+        self._blocked_until = 0.0
+        self._closing = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+        self.sent_messages = 0
+        self.sent_embeds = 0
+        self.dropped_full = 0  # Queue was full
+        self.dropped_failed = 0  # Retries ran out or the webhook rejected the message
+        self.rate_limited = 0  # 429 responses
+
+    def send(self, url, embed, attachment=None):
+        """
+        Queues an embed for the given webhook URL without blocking.
+
+        :param url: The webhook URL.
+        :param embed: The embed dict.
+        :param attachment: Optional object whose encode() returns (filename, bytes, content type);
+                           the image is shown in the embed.
+        :return: True if queued, False if the queue was full and the embed was dropped.
+        """
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((url, embed, attachment))
+            return True
+        except queue.Full:
+            self.dropped_full += 1
+            return False
+
+    def _ensure_worker(self):
+        """Starts the worker on first use, and again if it stopped, e.g. after close()."""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._closing.clear()
+                self._thread = threading.Thread(target=self._worker, name="WebhookDispatcher", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        """Returns (url, [embeds], attachment) for the next message, or None if closing with nothing left."""
+        first = self._held
+        self._held = None
+        while first is None:
+            try:
+                first = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                if self._closing.is_set():
+                    return None
+
+        url, embed, attachment = first
+        if attachment is not None:
+            return url, [embed], attachment
+        embeds = [embed]
+        chars = _embed_chars(embed)
+        deadline = time.monotonic() + (0 if self._closing.is_set() else self.batch_window)
+        while len(embeds) < self.MAX_EMBEDS:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item[0] != url or item[2] is not None or chars + _embed_chars(item[1]) > self.MAX_EMBED_CHARS:
+                self._held = item
+                break
+            embeds.append(item[1])
+            chars += _embed_chars(item[1])
+        return url, embeds, None
+
+    @staticmethod
+    def _retry_after(response):
+        header = response.headers.get("Retry-After")
+        if header is not None:
+            try:
+                return float(header)
+            except ValueError:
+                pass
+        try:
+            return float(response.json().get("retry_after", 1.0))
+        except (ValueError, TypeError, AttributeError):  # Not JSON, not an object, or not a number
+            return 1.0
+
+    def _encode(self, attachment, embed):
+        """Encodes an attachment and points the embed's image at it. Returns the requests files dict, or None."""
+        try:
+            filename, data, content_type = attachment.encode()
+        except Exception as e:
+            print(f"Error encoding webhook attachment: {e}")
+            return None
+        embed["image"] = {"url": f"attachment://{filename}"}
+        return {"files[0]": (filename, data, content_type)}
+
+    def _post(self, url, embeds, attachment=None):
+        import requests  # Imported on the worker, so startup doesn't pay for it
+
+        if self._session is None:
+            self._session = requests.Session()
+        files = self._encode(attachment, embeds[0]) if attachment is not None else None
+        payload = {"username": self.username, "embeds": embeds}
+        for attempt in range(self.max_retries + 1):
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                if files:
+                    response = self._session.post(url, data={"payload_json": json.dumps(payload)}, files=files,
+                                                  timeout=self.timeout)
+                else:
+                    response = self._session.post(url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                print(f"Error sending Discord webhook: {e}")
+                self._blocked_until = time.monotonic() + 2 ** attempt
+                continue
+
+            if response.status_code == 429:
+                self.rate_limited += 1
+                self._blocked_until = time.monotonic() + self._retry_after(response)
+                continue
+            if response.status_code >= 500:
+                self._blocked_until = time.monotonic() + 2 ** attempt
+                continue
+            if response.status_code >= 400:
+                print(f"Discord webhook error: HTTP {response.status_code}, {response.text}")
+                break
+
+            self.sent_messages += 1
+            self.sent_embeds += len(embeds)
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                try:
+                    reset_after = float(response.headers.get("X-RateLimit-Reset-After", 1.0))
+                except ValueError:
+                    reset_after = 1.0
+                self._blocked_until = time.monotonic() + reset_after
+            return True
+
+        self.dropped_failed += len(embeds)
+        return False
+
+    def _worker(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._post(*batch)
+            except Exception as e:
+                # One bad response must not stop every later message from being sent
+                print(f"Error sending Discord webhook: {e}")
+                self.dropped_failed += len(batch[1])
+
+    def close(self, timeout=5):
+        """Sends what is still queued, for up to timeout seconds, then stops the worker."""
+        self._closing.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        """
+        Returns the delivery counters.
+
+        :return: A dict with 'sent_messages', 'sent_embeds', 'queued', 'dropped_full',
+                 'dropped_failed' and 'rate_limited'.
+        """
+        return {
+            "sent_messages": self.sent_messages,
+            "sent_embeds": self.sent_embeds,
+            "queued": self._queue.qsize(),
+            "dropped_full": self.dropped_full,
+            "dropped_failed": self.dropped_failed,
+            "rate_limited": self.rate_limited,
+        }
+
+
+if __name__ == "__main__":
+    # Posts a burst of log lines to a local stand-in that rate-limits the first request
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    received = []
+
+    class StandIn(BaseHTTPRequestHandler):
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers["Content-Length"]))
+            if self.headers["Content-Type"].startswith("multipart/"):
+                received.append(f"1 + {len(raw):,} byte upload")
+                self.send_response(200)
+                self.end_headers()
+                return
+            body = json.loads(raw)
+            if not received and not getattr(self.server, "limited", False):
+                self.server.limited = True
+                self.send_response(429)
+                self.send_header("Retry-After", "0.3")
+                self.end_headers()
+                return
+            received.append(len(body["embeds"]))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/webhook"
+
+    dispatcher = WebhookDispatcher(max_queue=20)
+    started = time.perf_counter()
+    for i in range(25):
+        dispatcher.send(url, make_log_embed(f"line {i}", "info", "INFO", "00:00:00"))
+    queued_in = time.perf_counter() - started
+    import numpy as np
+    from Snapshot import Snapshot
+    frame = np.random.default_rng(0).integers(0, 255, (419, 462, 3), dtype=np.uint8)
+    dispatcher.send(url, make_log_embed("Match found!", "success", "SUCCESS", "00:00:00"), Snapshot(frame.copy()))
+    dispatcher.close()
+    server.shutdown()
+
+    print(f"Queued 25 lines in {queued_in * 1000:.2f} ms")
+    print(f"Messages received: {len(received)} with {received} embeds")
+    print(f"Stats: {dispatcher.stats()}")
@@ -3,25 +3,62 @@ import sys
 from time import sleep
 import win32gui
 import win32con
-from PIL import ImageGrab
-from screen_ocr import Reader
+from PIL import Image
+from screen_ocr import Reader, ScreenContents
+from screen_ocr._base import OcrResult
 from Events import Events
+from FrameSource import ScreenFrameSource
+from FrameCache import FrameCache
+from ColorSearch import get_matcher
+from OcrCache import OcrCache
+from Startup import STARTUP
+from TextLocator import compose_regions, find_text_regions, remap_result
 
 
 class WindowManager:
-    def __init__(self, config_path='data/config.json'):
+    def __init__(self, config_path='data/config.json', frame_source=None, ocr_reader_factory=None):
+        """
+        :param config_path: Path to the JSON configuration file.
+        :param frame_source: Optional FrameSource to read frames from. If None, a
+                             ScreenFrameSource is created for the window in setup_window().
+                             Either way, reads go through a FrameCache so one grab is
+                             shared by every read within 'frame_cache_ttl' seconds.
+        :param ocr_reader_factory: Optional callable returning the screen_ocr Reader, e.g. the
+                             get() of a Preload warming it up in the background. Called on
+                             the first OCR. Defaults to Reader.create_quality_reader.
+        """
         self.config = self._load_config(config_path)
         self.os_name = sys.platform
 
         self.hwnd = None  # Window handle
-        self.ocr_reader = Reader.create_quality_reader()
+        self.frame_cache = None
+        self.frame_source = None
+        if frame_source is not None:
+            self._set_frame_source(frame_source)
+        # Built on first use, so window setup and camera alignment don't wait for the OCR engine
+        self._ocr_reader = None
+        self._ocr_reader_factory = ocr_reader_factory or Reader.create_quality_reader
+        self.ocr_cache = OcrCache(
+            capacity=self.config.get('ocr_cache_size', 32),
+        )
         self.debug = Events().debug  # Debug logging function
 
+    @property
+    def ocr_reader(self):
+        if self._ocr_reader is None:
+            self._ocr_reader = self._ocr_reader_factory()
+        return self._ocr_reader
+
     def _load_config(self, path):
         """Loads the JSON configuration file."""
         with open(path, 'r') as f:
             return json.load(f)
 
+    def _set_frame_source(self, source):
+        """Puts a FrameCache in front of the given source and reads from it from now on."""
+        self.frame_cache = FrameCache(source, ttl=self.config.get('frame_cache_ttl', 0.05))
+        self.frame_source = self.frame_cache
+
     def setup_window(self):
         """Finds, activates, and standardizes the target window using Windows API."""
         
@@ -59,6 +96,10 @@ class WindowManager:
                                 win32con.SWP_NOMOVE | win32con.SWP_NOZORDER)
             sleep(0.5)
 
+            if self.frame_source is None:
+                self._set_frame_source(ScreenFrameSource(self.hwnd))
+            self.frame_source.open()
+
             self.debug("Window setup complete!")
             return True
 
@@ -83,24 +124,53 @@ class WindowManager:
         client_to_screen = win32gui.ClientToScreen(self.hwnd, (center_x, center_y))
         return client_to_screen
 
-    def get_words_in_bounding_box(self, bounding_box):
+    def get_words_in_bounding_box(self, bounding_box, use_cache=True, localize_text=False):
         """
         Performs OCR on a screen region and returns a list of lowercase text lines.
         
         Args:
             bounding_box: A tuple (left, top, right, bottom) defining the area.
-            ocr_reader: An initialized screen_ocr.Reader instance.
+            use_cache: If True, a region identical to one OCR'd recently
+                       (same pixel digest) returns the stored result without running OCR.
+            localize_text: If True, only the bands of the region that look like text are
+                       OCR'd (stacked into one small image), instead of the whole region.
 
         Returns:
             A list of tuples, where each tuple contains:
             - A lowercase string of the detected line of text.
             - A tuple (x, y) for the line's center coordinates.
         """
+        return self.read_words(self.grab_frame(bounding_box), bounding_box, use_cache, localize_text)
+
+    def read_words(self, pixels, bounding_box, use_cache=True, localize_text=False):
+        """
+        Same as get_words_in_bounding_box, but OCRs pixels that were already captured.
+
+        Args:
+            pixels: The RGB crop of bounding_box, e.g. from grab_frame(bounding_box).
+            bounding_box: The client-area box the pixels were cropped from.
+            use_cache: See get_words_in_bounding_box.
+            localize_text: See get_words_in_bounding_box.
+        """
+        cache_key = None
+        if use_cache and self.ocr_cache is not None:
+            cache_key = self.ocr_cache.key_for(tuple(bounding_box), pixels)
+            cached = self.ocr_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         #convert make bounding_box screen coordinates
         screen_left, screen_top = win32gui.ClientToScreen(self.hwnd, (bounding_box[0], bounding_box[1]))
         screen_right, screen_bottom = win32gui.ClientToScreen(self.hwnd, (bounding_box[2], bounding_box[3]))
 
-        result = self.ocr_reader.read_screen((screen_left, screen_top, screen_right, screen_bottom))
+        screen_box = (screen_left, screen_top, screen_right, screen_bottom)
+        if localize_text:
+            result = self._read_text_regions(pixels, screen_box)
+        else:
+            # OCR the crop of the captured frame; passing the screen box keeps word coordinates in screen space
+            result = self.ocr_reader.read_image(Image.fromarray(pixels), bounding_box=screen_box)
+
+        STARTUP.mark("first frame", report=True)
 
         output = []
         for line in result.result.lines:
@@ -116,66 +186,96 @@ class WindowManager:
             mid_x = int((first_word.left + (last_word.left + last_word.width)) / 2)
             
             output.append((line_text, (mid_x, mid_y)))
-            
+
+        if cache_key is not None:
+            self.ocr_cache.put(cache_key, (output, result))
         return output, result
 
+    def _read_text_regions(self, pixels, screen_box):
+        """
+        OCRs only the text-like bands of a crop and returns ScreenContents in screen coordinates.
+
+        :param pixels: The RGB crop of the region.
+        :param screen_box: The region in screen coordinates (left, top, right, bottom).
+        """
+        regions = find_text_regions(pixels)
+        if not regions:
+            # Nothing that looks like text; skip OCR entirely
+            return ScreenContents(
+                screen_coordinates=None,
+                bounding_box=screen_box,
+                screenshot=None,
+                result=OcrResult([]),
+                confidence_threshold=self.ocr_reader.confidence_threshold,
+                homophones=self.ocr_reader.homophones,
+                search_radius=None,
+            )
+
+        composite, placements = compose_regions(pixels, regions)
+        contents = self.ocr_reader.read_image(Image.fromarray(composite))
+        contents.result = remap_result(contents.result, placements, offset=screen_box[0:2])
+        contents.bounding_box = screen_box
+        return contents
+
+    def grab_frame(self, bounding_box=None, fresh=False):
+        """
+        Returns the current frame of the client area, or a crop of it.
+
+        :param bounding_box: Optional tuple (left, top, right, bottom) in client coordinates.
+        :param fresh: Capture a new frame instead of reusing one from the frame cache, e.g. when
+                      polling for the screen to change.
+        :return: An RGB uint8 NumPy array. It may share memory with the frame source's
+                 reused buffer, so copy it if it has to outlive the next grab.
+        """
+        if fresh and self.frame_cache is not None:
+            self.frame_cache.invalidate()
+        frame = self.frame_source.grab()
+        if bounding_box is None:
+            return frame
+        left, top, right, bottom = bounding_box
+        return frame[top:bottom, left:right]
+
     def save_screenshot(self, filename, bounding_box=None):
         """
         Saves a screenshot of the current window or a specified bounding box.
 
         :param filename: The name of the file to save the screenshot.
-        :param bounding_box: Optional tuple (left, top, right, bottom) for a specific area.
+        :param bounding_box: Optional tuple (left, top, right, bottom) in client coordinates.
                             If None, captures the entire client area.
         """
         if not self.hwnd:
             self.debug("Error: Window not set up. Call setup_window() first.")
             return
-        
-        if bounding_box is None:
-            # Get client area coordinates
-            left, top, right, bottom = win32gui.GetClientRect(self.hwnd)
-            screen_left, screen_top = win32gui.ClientToScreen(self.hwnd, (left, top))
-            screen_right, screen_bottom = win32gui.ClientToScreen(self.hwnd, (right, bottom))
-            bounding_box = (screen_left, screen_top, screen_right, screen_bottom)
-
-        screenshot = ImageGrab.grab(bbox=bounding_box)
-        screenshot.save(filename)
+
+        Image.fromarray(self.grab_frame(bounding_box)).save(filename)
         self.debug(f"Screenshot saved as {filename}")
 
-    def find_color(self, hex_color, threshold=10):
+    def find_color(self, hex_color, threshold=10, roi=None):
         """
-        Finds the first occurrence of a color in the window's client area.
+        Finds the first occurrence of a color (or any of several colors) in the window's client area.
 
-        :param hex_color: The hex color string (e.g., "D83228").
+        :param hex_color: The hex color string (e.g., "D83228"), or a list of them to search in one pass.
         :param threshold: The tolerance for color matching (0-255).
+        :param roi: Optional (left, top, right, bottom) client-area region to search instead of the whole frame.
         :return: A tuple (x, y) of the client coordinates, or None if not found.
         """
-        # 1. Get window client area and take a screenshot
-        left, top, right, bottom = win32gui.GetClientRect(self.hwnd)
-        
-        # Adjust to screen coordinates for the screenshot
-        screen_left, screen_top = win32gui.ClientToScreen(self.hwnd, (left, top))
-        screen_right, screen_bottom = win32gui.ClientToScreen(self.hwnd, (right, bottom))
+        return self._get_color_matcher(hex_color, threshold).find_first(self.grab_frame(), roi=roi)
 
-        screenshot = ImageGrab.grab(bbox=(screen_left, screen_top, screen_right, screen_bottom))
-        img_np = np.array(screenshot)
-
-        # 2. Convert hex to RGB
-        r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        target_color = np.array([r, g, b])
-
-        # 3. Find pixels within the threshold
-        diff = np.abs(img_np - target_color)
-        distance = np.sum(diff, axis=2)
-        matching_pixels = np.where(distance <= threshold)
+    def find_color_mask(self, hex_color, threshold=10, roi=None):
+        """
+        Finds every pixel matching a color (or any of several colors) in the window's client area.
 
-        # 4. Return the first match's client coordinates
-        if matching_pixels[0].size > 0:
-            # These are relative to the screenshot, which is the client area
-            y, x = matching_pixels[0][0], matching_pixels[1][0]
-            return int(x), int(y)
+        :param hex_color: The hex color string (e.g., "D83228"), or a list of them.
+        :param threshold: The tolerance for color matching (0-255).
+        :param roi: Optional (left, top, right, bottom) client-area region to search.
+        :return: A boolean NumPy mask the size of the region, True where a pixel matches.
+        """
+        return self._get_color_matcher(hex_color, threshold).find_all(self.grab_frame(), roi=roi)
 
-        return None
+    def _get_color_matcher(self, hex_color, threshold):
+        """Returns the cached ColorMatcher for one color or a list of colors."""
+        colors = (hex_color,) if isinstance(hex_color, str) else tuple(hex_color)
+        return get_matcher(colors, threshold)
 
     def get_color_at_pixel(self, x, y):
         """
@@ -188,20 +288,6 @@ class WindowManager:
         if not self.hwnd:
             self.debug("Error: Window not set up. Call setup_window() first.")
             return None
-        
-        screen_x, screen_y = win32gui.ClientToScreen(self.hwnd, (x, y))
-        screenshot = ImageGrab.grab(bbox=(screen_x, screen_y, screen_x + 1, screen_y + 1))
-        pixel_value = screenshot.getpixel((0, 0))
-        
-        #rgb
-        if isinstance(pixel_value, tuple):
-            if len(pixel_value) >= 3:
-                return pixel_value[:3]  # RGB or RGBA
-            elif len(pixel_value) == 1:
-                return (pixel_value[0], pixel_value[0], pixel_value[0])
-            else:
-                return (0, 0, 0)
-        elif isinstance(pixel_value, (int, float)):
-            return (int(pixel_value), int(pixel_value), int(pixel_value))
-        else:
-            return (0, 0, 0)
\ No newline at end of file
+
+        r, g, b = self.grab_frame()[y, x]
+        return int(r), int(g), int(b)
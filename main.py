@@ -1,61 +1,119 @@
-from WindowManager import WindowManager
-from InputManager import InputManager
-from GameActions import GameActions
-from GuiManager import GuiManager # Import the new class
+from Startup import STARTUP, Preload  # First, so the startup report covers every import
 from time import sleep
 from SettingsManager import SettingsManager # Import the new class
 
-from ActionQueue import ActionQueue
+from ActionQueue import ActionQueue, PRIORITY_COLLECT
+from CashScheduler import CashScheduler
+from ScanScheduler import AdaptiveCadence
+from Snapshot import CONTENT_TYPES
 from Events import Events
 
+# Started by __main__ so the OCR engine loads while the GUI comes up
+ocr_preload = None
+
+
+def create_ocr_reader():
+    from screen_ocr import Reader
+    return Reader.create_quality_reader()
+
+
 def main_bot_logic(settings, stop_event):
     """The main logic for the bot, to be run in a thread."""
     # --- Initialization ---
     status = Events().change_status
     logdb = Events().debug
+    STARTUP.mark("bot start")
 
     status("Initializing bot components...")
-    window_manager = WindowManager()
-    if not window_manager.setup_window():
-        status("Exiting: Could not set up game window.", "red")
-        return
+    with STARTUP.stage("import bot"):
+        # Loaded here rather than at the top, so screen_ocr is imported by the warm-up thread
+        from WindowManager import WindowManager
+        from InputManager import InputManager
+        from GameActions import GameActions
+
+    with STARTUP.stage("window setup"):
+        window_manager = WindowManager(ocr_reader_factory=ocr_preload.get if ocr_preload else None)
+        if not window_manager.setup_window():
+            status("Exiting: Could not set up game window.", "red")
+            return
 
     input_manager = InputManager(window_manager.hwnd)
-    action_queue = ActionQueue()
+    action_queue = ActionQueue(max_defer=settings.get("collect_max_defer", 30))
     game_actions = GameActions(window_manager, input_manager, stop_event, action_queue)
+    cash_scheduler = CashScheduler.from_settings(settings, clock=action_queue.clock, log=logdb)
+    game_actions.cash_scheduler = cash_scheduler
+    if settings.get("send_to_discord") and settings.get("webhook_screenshots"):
+        image_format = settings.get("screenshot_format", "webp")
+        if image_format not in CONTENT_TYPES:
+            Events().log(f"Unsupported screenshot_format '{image_format}', using webp. "
+                         f"Supported: {', '.join(CONTENT_TYPES)}")
+            image_format = "webp"
+        game_actions.snapshot_settings = {
+            "image_format": image_format,
+            "max_side": settings.get("screenshot_max_side", 320),
+            "max_bytes": settings.get("screenshot_max_bytes", 200000),
+        }
 
     # --- Preparation ---
     status("Preparing game window...")
-    game_actions.align_camera()
+    with STARTUP.stage("camera alignment"):
+        game_actions.align_camera()
     status("Starting bot actions in 1 second...")
     sleep(1)
 
     logdb(f"Settings received: {settings}")
     status("Bot is running. Press F7 to stop.", "green")
 
+    def collect_money():
+        # Collect, then schedule the next collection: when it pays off, or one interval from now
+        started = action_queue.clock()
+        game_actions.collect_money()
+        if cash_scheduler is not None:
+            cash_scheduler.record_collect(action_queue.clock() - started)
+            schedule_collection(cash_scheduler.next_collect_time)
+        else:
+            schedule_collection(action_queue.clock() + settings.get("collect_money_interval"))
+
+    def schedule_collection(start_by):
+        # start_by is when the collection should begin (a clock time or a callable returning one), but
+        # ActionQueue deadlines are finish-by times, so add the time a collection takes
+        def deadline():
+            start = start_by() if callable(start_by) else start_by
+            return start + action_queue.estimate("collect_money", game_actions.COLLECT_ESTIMATE)
+
+        action_queue.add(collect_money, priority=PRIORITY_COLLECT, deadline=deadline,
+                         estimated_duration=game_actions.COLLECT_ESTIMATE, name="collect_money")
+
+    if settings.get("auto_collect_money"):
+        schedule_collection(action_queue.clock())
+
     # --- Main Loop ---
     while not stop_event.is_set():
-        # The bot alternates between collecting money and scanning for Brainrots.
-        # The duration of the scan is determined by the money collection interval.
+        # The bot scans for Brainrots and the action queue decides when to stop for other work.
+        # Money collection is due when the CashScheduler says it beats scanning (or every
+        # collect_money_interval without it) and waits for a quiet moment in the scan.
 
-        # 1. Handle Money Collection
-        if settings.get("auto_collect_money"):
-            game_actions.collect_money()
+        # 1. Run whatever is due, e.g. money collection
+        if action_queue.run_due():
+            logdb(f"Action timings: {action_queue.stats()}")
 
         if stop_event.is_set(): break  # noqa: E701
 
-        # 2. Handle Brainrot Scanning
+        # 2. Handle Brainrot Scanning until the action queue needs the bot
         if settings.get("auto_scan_npcs"):
-            scan_duration = settings.get("collect_money_interval") if settings.get("auto_collect_money") else None
-            
             game_actions.scan_npcs(
                 min_income=settings.get("income_threshold"),
                 min_rarity=settings.get("min_rarity"),
-                stop_time=scan_duration
+                stop_time=None,
+                skip_static_frames=settings.get("skip_static_frames", False),
+                change_threshold=settings.get("change_threshold", 2.0),
+                pipelined=settings.get("pipelined_scan", False),
+                capture_interval=settings.get("capture_interval", 0.05),
+                cadence=AdaptiveCadence.from_settings(settings)
             )
 
-        # If no actions are enabled, wait before checking again to avoid a busy loop.
-        if not settings.get("auto_collect_money") and not settings.get("auto_scan_npcs"):
+        # If not scanning, wait before checking the queue again to avoid a busy loop.
+        if not settings.get("auto_scan_npcs"):
             if stop_event.wait(timeout=1):
                 break
     
@@ -63,12 +121,18 @@ def main_bot_logic(settings, stop_event):
 
 
 if __name__ == "__main__":
+    ocr_preload = Preload("ocr warm-up", create_ocr_reader).start()
+
     settings_manager = SettingsManager()
     initial_settings = settings_manager.get_settings()
-    
-    gui = GuiManager(
-        app_logic_callback=main_bot_logic,
-        settings_manager=settings_manager,
 
-    )
+    with STARTUP.stage("import gui"):
+        from GuiManager import GuiManager # Import the new class
+    with STARTUP.stage("gui setup"):
+        gui = GuiManager(
+            app_logic_callback=main_bot_logic,
+            settings_manager=settings_manager,
+
+        )
+    gui.app.after(0, STARTUP.mark, "gui ready")
     gui.run()
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Tests NameplateParser on OCR outputs recorded from the (148, 95, 610, 514) scan box.
+
+Run with: python -m unittest test_NameplateParser
+"""
+import unittest
+
+from NameplateParser import NameplateParser
+
+# (recorded lines, expected (rarity, income, name))
+RECORDED = [
+    ([("tralalero tralala", (379, 301)), ("legendary", (379, 324)), ("$1.2k/s", (380, 347)), ("$25k", (380, 370))],
+     ("legendary", 1_200.0, "tralalero tralala")),
+    ([("brr brr patapim", (372, 296)), ("brainrot god", (372, 318)), ("$4.5m/s", (373, 341))],
+     ("brainrot", 4_500_000.0, "brr brr patapim")),
+    ([("noobini pizzanini", (375, 300)), ("common", (375, 322)), ("$1/s", (376, 344)), ("$25", (376, 366))],
+     ("common", 1.0, "noobini pizzanini")),
+    ([("la vacca saturno saturnita", (380, 298)), ("secret", (380, 320)), ("$250k/s", (381, 342))],
+     ("secret", 250_000.0, "la vacca saturno saturnita")),
+    ([("lirili larila", (370, 305)), ("rare", (370, 327)), ("$3/s", (371, 349)), ("$250", (371, 371))],
+     ("rare", 3.0, "lirili larila")),
+]
+
+
+class NameplateParserTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = NameplateParser()
+
+    def test_recorded_nameplates(self):
+        for lines, (rarity, income, name) in RECORDED:
+            with self.subTest(name=name):
+                detection = self.parser.parse(lines)
+                self.assertEqual(detection.rarity, rarity)
+                self.assertEqual(detection.income, income)
+                self.assertEqual(detection.name, name)
+                self.assertFalse(detection.partial)
+
+    def test_price_is_not_income(self):
+        # The "$25k" purchase price below the income must not replace it
+        detection = self.parser.parse(RECORDED[0][0])
+        self.assertEqual(detection.income_str, "1.2k")
+
+    def test_empty_read(self):
+        detection = self.parser.parse([])
+        self.assertIsNone(detection.rarity)
+        self.assertIsNone(detection.income)
+        self.assertFalse(detection.partial)
+
+    def test_partial_read(self):
+        detection = self.parser.parse([("tralalero tralala", (379, 301)), ("legendary", (379, 324))])
+        self.assertEqual(detection.rarity, "legendary")
+        self.assertIsNone(detection.income)
+        self.assertTrue(detection.partial)
+
+    def test_lowest_rarity_wins(self):
+        detection = self.parser.parse([("x", (0, 0)), ("common legendary", (0, 0)), ("$5/s", (0, 0))])
+        self.assertEqual(detection.rarity, "common")
+
+    def test_no_name_without_a_line_above_the_rarity(self):
+        detection = self.parser.parse([("legendary", (379, 324)), ("$1.2k/s", (380, 347))])
+        self.assertEqual(detection.rarity, "legendary")
+        self.assertIsNone(detection.name)
+
+    def test_ocr_confusion_in_income(self):
+        # "l" read for "1"
+        detection = self.parser.parse([("tralalero", (379, 301)), ("$l.2k/s", (380, 347))])
+        self.assertEqual(detection.income, 1_200.0)
+        self.assertTrue(detection.partial)
+
+    def test_misspelled_rarities(self):
+        for misread, rarity in [("legendory", "legendary"), ("mythlc", "mythic"), ("brainrat god", "brainrot"),
+                                ("secrel", "secret"), ("comon", "common")]:
+            with self.subTest(misread=misread):
+                detection = self.parser.parse([("tralalero tralala", (379, 301)), (misread, (379, 324)),
+                                               ("$1.2k/s", (380, 347))])
+                self.assertEqual(detection.rarity, rarity)
+                self.assertEqual(detection.name, "tralalero tralala")
+                self.assertFalse(detection.partial)
+
+    def test_exact_rarity_beats_misspelled_one(self):
+        # The fuzzy fallback only runs when no rarity is spelled exactly
+        detection = self.parser.parse([("comon", (0, 0)), ("legendary", (0, 0)), ("$5/s", (0, 0))])
+        self.assertEqual(detection.rarity, "legendary")
+
+    def test_names_are_not_rarities(self):
+        for lines, _ in RECORDED:
+            names_only = [line for line in lines if not any(r in line[0] for r in self.parser.rarities)]
+            with self.subTest(lines=names_only):
+                self.assertIsNone(self.parser.parse(names_only).rarity)
+
+    def test_fuzzy_matching_can_be_disabled(self):
+        detection = NameplateParser(fuzzy_cutoff=None).parse([("legendory", (0, 0)), ("$5/s", (0, 0))])
+        self.assertIsNone(detection.rarity)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests OcrCache keys on rendered nameplate text over changing backgrounds.
+
+Run with: python -m unittest test_OcrCache
+"""
+import unittest
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from OcrCache import OcrCache
+
+BOX = (148, 95, 610, 514)
+
+
+def render(lines, seed, offset=(0, 0)):
+    """Draws white text with a dark outline over a random dark scene, like a nameplate in game."""
+    rng = np.random.default_rng(seed)
+    scene = rng.integers(0, 140, size=(60, 80, 3), dtype=np.uint8)
+    image = Image.fromarray(np.kron(scene, np.ones((4, 4, 1), dtype=np.uint8)))
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+    for row, text in enumerate(lines):
+        draw.text((60 + offset[0], 60 + offset[1] + row * 24), text, fill=(255, 255, 255), font=font,
+                  stroke_width=1, stroke_fill=(0, 0, 0))
+    return np.asarray(image)
+
+
+class OcrCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = OcrCache()
+        self.lines = ["tralalero tralala", "legendary", "$1.2k/s"]
+
+    def test_same_text_on_a_changed_background_hits(self):
+        self.cache.put(self.cache.key_for(BOX, render(self.lines, seed=1)), "read")
+        self.assertEqual(self.cache.get(self.cache.key_for(BOX, render(self.lines, seed=2))), "read")
+
+    def test_income_change_misses(self):
+        self.cache.put(self.cache.key_for(BOX, render(self.lines, seed=1)), "read")
+        changed = ["tralalero tralala", "legendary", "$1.3k/s"]
+        self.assertIsNone(self.cache.get(self.cache.key_for(BOX, render(changed, seed=1))))
+        self.assertIsNone(self.cache.get(self.cache.key_for(BOX, render(changed, seed=2))))
+
+    def test_moved_text_misses(self):
+        # A hit would return word coordinates for where the text used to be
+        self.cache.put(self.cache.key_for(BOX, render(self.lines, seed=1)), "read")
+        self.assertIsNone(self.cache.get(self.cache.key_for(BOX, render(self.lines, seed=1, offset=(12, 0)))))
+
+    def test_eviction(self):
+        cache = OcrCache(capacity=1)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+"""
+Tests ReplayHarness on small OCR-only recordings.
+
+Run with: python -m unittest test_ReplayHarness
+"""
+import unittest
+
+from ReplayHarness import replay
+
+BUY = [["legendary", [379, 324]], ["$1.2k/s", [380, 347]]]
+SKIP = [["common", [375, 322]], ["$1/s", [376, 344]]]
+
+
+class ReplayHarnessTest(unittest.TestCase):
+    def assertDecisions(self, records, expected):
+        report = replay(ocr_records=records, min_income=1000)
+        self.assertEqual(report["ticks"], len(expected))
+        self.assertEqual([d["bought"] for d in report["detections"]], expected)
+
+    def test_records_without_frames(self):
+        self.assertDecisions([{"lines": BUY}, {"lines": SKIP}, {"lines": BUY}], [True, False, True])
+
+    def test_frame_keyed_records_play_in_frame_order(self):
+        self.assertDecisions([{"frame": 2, "lines": BUY}, {"frame": 0, "lines": SKIP}, {"frame": 1, "lines": SKIP}],
+                             [False, False, True])
+
+
+if __name__ == "__main__":
+    unittest.main()